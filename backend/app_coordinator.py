@@ -2,16 +2,22 @@
 import asyncio
 import logging
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set
+
+import httpx
 
 from backend.event_bus import EventBus
 from backend.asr_bridge import ASRBridge
 from backend.trigger_engine import TriggerEngine
 from backend.capture_coordinator import CaptureCoordinator
+from backend.image_loader import ImageLoader
+from backend.image_writer import ImageWriter
+from backend.vision_cache import VisionCache, image_hash
 from backend.vision_adapter import VisionLLMAdapter, QwenOmniAdapter, MockVisionAdapter
 from backend.models import Event, EventType, RequestState
-from backend.config import Settings
+from backend.config import Settings, api_key_configured
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +38,8 @@ class AppCoordinator:
         self.asr_bridge = ASRBridge(
             api_key=settings.asr_api_key,
             endpoint=settings.asr_endpoint,
-            event_bus=self.event_bus
+            event_bus=self.event_bus,
+            flush_threshold=settings.asr_flush_threshold
         )
         
         # Initialize trigger engine
@@ -47,8 +54,18 @@ class AppCoordinator:
             timeout_seconds=settings.capture_timeout_seconds
         )
         
+        # Batched, off-loop reader and writer for captured images
+        self.image_loader = ImageLoader()
+        self.image_writer = ImageWriter()
+        self._images_dir = Path("images").resolve()
+        # Received image bytes by req_id, oldest first; events carry only the
+        # reference. Bounded, since a dropped CAPTURE_RECEIVED or an image for
+        # a req_id nobody waits on would otherwise never be released.
+        self._image_store: "OrderedDict[str, bytes]" = OrderedDict()
+        self.max_stashed_images = 4
+        
         # Initialize vision adapter
-        if settings.vision_api_key and settings.vision_api_key != "your_vision_api_key_here":
+        if api_key_configured(settings.vision_api_key):
             self.vision_adapter: VisionLLMAdapter = QwenOmniAdapter(
                 api_key=settings.vision_api_key,
                 model=settings.vision_model,
@@ -59,19 +76,53 @@ class AppCoordinator:
             logger.warning("Using mock vision adapter (no API key configured)")
             self.vision_adapter = MockVisionAdapter()
         
+        # Cache of recent vision results for prompts equal after normalization
+        self.vision_cache = VisionCache(maxsize=1024, ttl_seconds=3600)
+        # Fire-and-forget tasks (connection prewarm) kept alive until done
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        # Event type -> handler table; each type gets its own subscription
+        self._handlers = {
+            EventType.ASR_FINAL.value: self.handle_asr_final,
+            EventType.TRIGGER_FIRED.value: self.handle_trigger_fired,
+            EventType.CAPTURE_RECEIVED.value: self.handle_capture_received,
+        }
+        
         self.running = False
         self.tasks = []
         
+        # Event timestamps come from the loop clock shifted to wall time
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wall_offset = 0.0
+        
         logger.info("AppCoordinator initialized")
     
-    async def start(self):
-        """Start the application coordinator"""
+    async def start(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Start the application coordinator.
+        
+        Args:
+            http_client: Application-scoped HTTP client for outbound calls;
+                adapters fall back to their own pooled client if omitted
+        """
         self.running = True
         logger.info("Starting AppCoordinator...")
         
-        # Start event processing task
-        event_task = asyncio.create_task(self.process_events())
-        self.tasks.append(event_task)
+        if http_client is not None:
+            self.vision_adapter.use_http_client(http_client)
+        
+        # uvloop is installed by the entry point; log which loop is driving us
+        self._loop = asyncio.get_running_loop()
+        self._wall_offset = time.time() - self._loop.time()
+        logger.info(f"Event loop: {type(self._loop).__module__}.{type(self._loop).__name__}")
+        
+        # One subscription per handled event type, so the bus only queues
+        # events we act on and a slow handler does not block other types.
+        # This also gives TRIGGER_FIRED/CAPTURE_RECEIVED their own queues:
+        # a burst of ASR events can never delay trigger -> capture handling.
+        for event_type, handler in self._handlers.items():
+            event_task = asyncio.create_task(self.process_events(event_type, handler))
+            self.tasks.append(event_task)
         
         logger.info("AppCoordinator started")
     
@@ -83,33 +134,40 @@ class AppCoordinator:
         # Cancel all tasks
         for task in self.tasks:
             task.cancel()
+        for task in list(self._background_tasks):
+            task.cancel()
         
         # Close ASR connection
         await self.asr_bridge.close()
         
+        # Finish queued image archive writes and reads
+        await self.image_writer.close()
+        await self.image_loader.close()
+        
+        # Close pooled vision connections
+        await self.vision_adapter.close()
+        
         logger.info("AppCoordinator stopped")
     
-    async def process_events(self):
-        """Process events from event bus and coordinate actions"""
+    async def process_events(self, event_type: str, handler):
+        """
+        Process events of one type from the event bus.
+        
+        Args:
+            event_type: Event type to subscribe to
+            handler: Coroutine function called for each event
+        """
         try:
-            async for event in self.event_bus.subscribe("*"):
+            async for event in self.event_bus.subscribe(event_type):
                 if not self.running:
                     break
                 
-                # Handle different event types
-                if event.event_type == EventType.ASR_FINAL.value:
-                    await self.handle_asr_final(event)
-                
-                elif event.event_type == EventType.TRIGGER_FIRED.value:
-                    await self.handle_trigger_fired(event)
-                
-                elif event.event_type == EventType.CAPTURE_RECEIVED.value:
-                    await self.handle_capture_received(event)
+                await handler(event)
                 
         except asyncio.CancelledError:
-            logger.info("Event processing cancelled")
+            logger.info(f"Event processing cancelled: {event_type}")
         except Exception as e:
-            logger.error(f"Error processing events: {e}")
+            logger.error(f"Error processing {event_type} events: {e}")
     
     async def handle_asr_final(self, event: Event):
         """Handle ASR final text event"""
@@ -136,16 +194,27 @@ class AppCoordinator:
         # Request capture
         await self.capture_coordinator.request_capture(req_id, trigger_text)
         
-        # Wait for image
-        image_bytes = await self.capture_coordinator.wait_for_image(req_id)
+        # Warm the vision connection while the image is in flight; analysis
+        # never waits on it (prewarm never raises)
+        prewarm_task = asyncio.create_task(self.vision_adapter.prewarm())
+        self._background_tasks.add(prewarm_task)
+        prewarm_task.add_done_callback(self._background_tasks.discard)
         
-        if image_bytes:
-            # Image received, proceed to vision analysis
-            await self.analyze_with_vision(req_id, trigger_text, image_bytes)
-        else:
-            # Timeout or error
-            logger.error(f"Failed to receive image for req_id={req_id}")
-            self.trigger_engine.complete_request(req_id)
+        try:
+            # Wait for image
+            image_bytes = await self.capture_coordinator.wait_for_image(req_id)
+            
+            if image_bytes:
+                # Image received, proceed to vision analysis
+                await self.analyze_with_vision(req_id, trigger_text, image_bytes)
+            else:
+                # Timeout or error
+                logger.error(f"Failed to receive image for req_id={req_id}")
+                self.trigger_engine.complete_request(req_id)
+        finally:
+            # Release the image even after a capture timeout or cancel, or if
+            # it was never consumed
+            self._image_store.pop(req_id, None)
     
     async def handle_capture_received(self, event: Event):
         """Handle capture received event"""
@@ -154,15 +223,41 @@ class AppCoordinator:
         
         logger.info(f"Capture received: req_id={req_id}, filename={filename}")
         
-        # Load image from file
-        image_path = Path("images") / filename
+        # Take ownership of the stashed bytes; fall back to the archived file
+        image_bytes = self._image_store.pop(event.data.get("image_ref"), None)
+        if image_bytes is None:
+            image_path = self._images_dir / filename
+            try:
+                image_bytes = await self.image_loader.read(image_path)
+            except FileNotFoundError:
+                logger.error(f"Captured image not found: {image_path}")
+                return
         
-        if image_path.exists():
-            with open(image_path, "rb") as f:
-                image_bytes = f.read()
-            
-            # Notify capture coordinator
-            self.capture_coordinator.receive_image(req_id, image_bytes)
+        # Notify capture coordinator
+        self.capture_coordinator.receive_image(req_id, image_bytes)
+    
+    def stash_image(self, req_id: str, image_bytes: bytes) -> str:
+        """
+        Hold received image bytes until CAPTURE_RECEIVED is handled.
+        
+        Only the newest max_stashed_images are kept; older unclaimed images
+        are dropped, and handle_capture_received then falls back to the
+        archived file.
+        
+        Args:
+            req_id: Request ID the image belongs to
+            image_bytes: JPEG image data
+        
+        Returns:
+            Reference to put in the event data as "image_ref"
+        """
+        store = self._image_store
+        store.pop(req_id, None)
+        store[req_id] = image_bytes
+        while len(store) > self.max_stashed_images:
+            evicted, _ = store.popitem(last=False)
+            logger.warning(f"Dropping unclaimed image: req_id={evicted}")
+        return req_id
     
     async def analyze_with_vision(self, req_id: str, prompt: str, image_bytes: bytes):
         """Analyze image with vision model"""
@@ -174,14 +269,23 @@ class AppCoordinator:
         # Publish vision started event
         vision_started_event = Event(
             event_type=EventType.VISION_STARTED.value,
-            timestamp=time.time(),
+            timestamp=self._now(),
             req_id=req_id,
             data={"prompt": prompt}
         )
         await self.event_bus.publish(vision_started_event)
         
-        # Call vision model
-        result = await self.vision_adapter.analyze_image(image_bytes, prompt, req_id)
+        # Serve repeated questions about the same image from cache, else call
+        # vision model. Analyses never overlap (TRIGGER_FIRED is handled by one
+        # task, and TriggerEngine refuses a trigger while a request is active),
+        # so there is no concurrent identical call to collapse.
+        img_hash = image_hash(image_bytes)
+        result = self.vision_cache.get(img_hash, prompt)
+        if result is not None:
+            logger.info(f"Vision cache hit: req_id={req_id}")
+        else:
+            result = await self.vision_adapter.analyze_image(image_bytes, prompt, req_id)
+            self.vision_cache.put(img_hash, prompt, result)
         
         if result.error:
             # Vision analysis failed
@@ -189,7 +293,7 @@ class AppCoordinator:
             
             error_event = Event(
                 event_type=EventType.ERROR.value,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 req_id=req_id,
                 data={
                     "error_type": "vision_api_error",
@@ -203,7 +307,7 @@ class AppCoordinator:
             
             vision_result_event = Event(
                 event_type=EventType.VISION_RESULT.value,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 req_id=req_id,
                 data={
                     "text": result.text,
@@ -215,6 +319,12 @@ class AppCoordinator:
         # Complete request
         self.trigger_engine.complete_request(req_id)
     
+    def _now(self) -> float:
+        """Wall-clock event timestamp read from the (cheaper) loop clock"""
+        if self._loop is None:
+            return time.time()
+        return self._loop.time() + self._wall_offset
+    
     def get_event_bus(self) -> EventBus:
         """Get event bus instance"""
         return self.event_bus
@@ -1,15 +1,33 @@
 # ASR Bridge for Qwen3-ASR-Flash-Realtime
 import asyncio
 import websockets
-import json
 import logging
+import random
+import re
 import time
-from typing import Optional, AsyncIterator
+from collections import deque
+from typing import Deque, Optional, Union
 from backend.models import Event, EventType
 from backend.event_bus import EventBus
+from backend import fast_json
 
 logger = logging.getLogger(__name__)
 
+# Hoisted constants for the per-frame receive path
+_ASR_FINAL = EventType.ASR_FINAL.value
+_ASR_PARTIAL = EventType.ASR_PARTIAL.value
+_RESULT_KEY = '"result"'
+_RESULT_KEY_BYTES = b'"result"'
+_FINAL_STATUS = re.compile(r'"status"\s*:\s*2\b')
+_FINAL_STATUS_BYTES = re.compile(rb'"status"\s*:\s*2\b')
+
+
+def _is_final_frame(message: Union[str, bytes]) -> bool:
+    """Cheap check for a final-result frame without parsing the JSON"""
+    if isinstance(message, str):
+        return _FINAL_STATUS.search(message) is not None
+    return _FINAL_STATUS_BYTES.search(message) is not None
+
 
 class ASRBridge:
     """
@@ -17,15 +35,41 @@ class ASRBridge:
     Handles audio forwarding, transcription reception, and reconnection.
     """
     
-    def __init__(self, api_key: str, endpoint: str, event_bus: EventBus):
+    def __init__(
+        self,
+        api_key: str,
+        endpoint: str,
+        event_bus: EventBus,
+        flush_threshold: int = 6400,
+        flush_interval: float = 0.15
+    ):
         self.api_key = api_key
         self.endpoint = endpoint
         self.event_bus = event_bus
+        # Outgoing audio is coalesced into frames of at least flush_threshold
+        # bytes (6400 = 200 ms of 16 kHz PCM16); 0 sends every chunk as-is
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval  # seconds
+        self._send_buf = bytearray()
+        self._flush_task: Optional[asyncio.Task] = None
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self.connected = False
         self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 3
-        self.reconnect_delay = 5  # seconds
+        self.max_reconnect_attempts = 8
+        # Exponential backoff with jitter between reconnect attempts
+        self.base_delay = 0.25  # seconds
+        self.max_delay = 5.0  # seconds
+        # Reconnect budget is restored after this long connected
+        self.reconnect_budget_reset = 30.0  # seconds
+        self._connected_since: Optional[float] = None
+        # Raw result frames waiting to be parsed; partials are dropped
+        # oldest-first when full, finals are always kept
+        self.receive_queue_size = 64
+        self._frames: Deque[Union[str, bytes]] = deque()
+        self._frames_ready = asyncio.Event()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._parser_task: Optional[asyncio.Task] = None
+        self.dropped_partials = 0
         
     async def connect(self) -> bool:
         """Connect to ASR service"""
@@ -55,15 +99,19 @@ class ASRBridge:
                 }
             }
             
-            await self.ws.send(json.dumps(init_message))
+            await self.ws.send(fast_json.dumps(init_message))
             
             # Wait for acknowledgment
             response = await self.ws.recv()
-            result = json.loads(response)
+            result = fast_json.loads(response)
             
             if result.get("header", {}).get("status") == 20000000:
                 self.connected = True
-                self.reconnect_attempts = 0
+                self._connected_since = time.monotonic()
+                self._send_buf.clear()
+                if self._flush_task is None or self._flush_task.done():
+                    self._flush_task = asyncio.create_task(self._periodic_flush())
+                self._start_receiving()
                 logger.info("ASR service connected successfully")
                 return True
             else:
@@ -80,46 +128,58 @@ class ASRBridge:
             logger.warning("ASR not connected, cannot send audio")
             return
         
+        # Buffer binary audio data and send once a full frame is ready
+        self._send_buf += audio_chunk
+        if len(self._send_buf) >= self.flush_threshold:
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """Send any buffered audio to ASR service"""
+        if not self._send_buf or not self.ws:
+            return
+        
+        frame = bytes(self._send_buf)
+        self._send_buf.clear()
         try:
-            # Send binary audio data
-            await self.ws.send(audio_chunk)
+            await self.ws.send(frame)
         except Exception as e:
             logger.error(f"Failed to send audio to ASR: {e}")
             self.connected = False
     
-    async def receive_transcription(self) -> AsyncIterator[Event]:
-        """Receive transcription results from ASR service"""
-        if not self.connected or not self.ws:
-            logger.error("ASR not connected")
-            return
-        
+    async def _periodic_flush(self) -> None:
+        """Flush partially filled frames so trailing audio is not stranded"""
+        try:
+            while self.connected:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            pass
+    
+    def _start_receiving(self) -> None:
+        """Start the socket reader and frame parser tasks"""
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.create_task(self._reader())
+        if self._parser_task is None or self._parser_task.done():
+            self._parser_task = asyncio.create_task(self._parser())
+    
+    async def _reader(self) -> None:
+        """Pull raw frames off the socket into the parse queue"""
         try:
             async for message in self.ws:
-                try:
-                    result = json.loads(message)
-                    
-                    # Parse transcription result
-                    payload = result.get("payload", {})
-                    text = payload.get("result", "")
-                    is_final = payload.get("status") == 2
-                    
-                    if text:
-                        event_type = EventType.ASR_FINAL if is_final else EventType.ASR_PARTIAL
-                        event = Event(
-                            event_type=event_type.value,
-                            timestamp=time.time(),
-                            data={"text": text}
-                        )
-                        
-                        # Publish to event bus
-                        await self.event_bus.publish(event)
-                        yield event
-                        
-                except json.JSONDecodeError:
-                    logger.error("Invalid JSON from ASR service")
-                except Exception as e:
-                    logger.error(f"Error processing ASR result: {e}")
-                    
+                # Status/keep-alive frames carry no result; skip them unparsed
+                if isinstance(message, str):
+                    if _RESULT_KEY not in message:
+                        continue
+                elif _RESULT_KEY_BYTES not in message:
+                    continue
+                
+                if len(self._frames) >= self.receive_queue_size:
+                    self._drop_oldest_partial()
+                self._frames.append(message)
+                self._frames_ready.set()
+        
+        except asyncio.CancelledError:
+            pass
         except websockets.exceptions.ConnectionClosed:
             logger.warning("ASR connection closed")
             self.connected = False
@@ -127,20 +187,92 @@ class ASRBridge:
             logger.error(f"Error receiving from ASR: {e}")
             self.connected = False
     
+    def _drop_oldest_partial(self) -> None:
+        """Make room by dropping the oldest partial (superseded by later ones)"""
+        for i, frame in enumerate(self._frames):
+            if not _is_final_frame(frame):
+                del self._frames[i]
+                self.dropped_partials += 1
+                return
+        # Queue holds only finals; keep them all rather than lose text
+    
+    async def _parser(self) -> None:
+        """Parse queued frames and publish ASR events"""
+        try:
+            while True:
+                if not self._frames:
+                    self._frames_ready.clear()
+                    await self._frames_ready.wait()
+                    continue
+                
+                await self._handle_frame(self._frames.popleft())
+        except asyncio.CancelledError:
+            pass
+    
+    async def _handle_frame(self, message: Union[str, bytes]) -> None:
+        """Parse one result frame and publish it to the event bus"""
+        try:
+            result = fast_json.loads(message)
+            
+            # Parse transcription result
+            payload = result.get("payload", {})
+            text = payload.get("result", "")
+            is_final = payload.get("status") == 2
+            
+            if text:
+                event = Event(
+                    event_type=_ASR_FINAL if is_final else _ASR_PARTIAL,
+                    timestamp=time.time(),
+                    data={"text": text}
+                )
+                
+                # Publish to event bus
+                await self.event_bus.publish(event)
+        
+        except fast_json.JSONDecodeError:
+            logger.error("Invalid JSON from ASR service")
+        except Exception as e:
+            logger.error(f"Error processing ASR result: {e}")
+    
     async def reconnect(self) -> bool:
         """Attempt to reconnect to ASR service"""
+        # A connection that stayed up long enough restores the full budget
+        if (
+            self._connected_since is not None
+            and time.monotonic() - self._connected_since >= self.reconnect_budget_reset
+        ):
+            self.reconnect_attempts = 0
+        self._connected_since = None
+        
         if self.reconnect_attempts >= self.max_reconnect_attempts:
             logger.error("Max reconnect attempts reached")
             return False
         
         self.reconnect_attempts += 1
-        logger.info(f"Reconnecting to ASR (attempt {self.reconnect_attempts}/{self.max_reconnect_attempts})")
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.reconnect_attempts - 1))
+        delay *= random.uniform(0.5, 1.5)
+        logger.info(
+            f"Reconnecting to ASR in {delay:.2f}s "
+            f"(attempt {self.reconnect_attempts}/{self.max_reconnect_attempts})"
+        )
         
-        await asyncio.sleep(self.reconnect_delay)
+        await asyncio.sleep(delay)
         return await self.connect()
     
     async def close(self) -> None:
         """Close ASR connection"""
+        # Send trailing audio (the end of the last utterance) while the socket
+        # is still open; flush() logs and swallows send errors
+        await self.flush()
+        
+        for task in (self._flush_task, self._reader_task, self._parser_task):
+            if task:
+                task.cancel()
+        self._flush_task = None
+        self._reader_task = None
+        self._parser_task = None
+        self._frames.clear()
+        
         if self.ws:
             try:
                 await self.ws.close()
@@ -1,24 +1,77 @@
 # Audio Playback Coordinator for ESP32 Real-Time AI Assistant
 import asyncio
 import base64
-import json
+import hashlib
 import logging
-from typing import Optional, Dict
+import struct
+import time
+from typing import Optional, Dict, AsyncIterator, Awaitable, Iterator, Set, Tuple
 from dataclasses import dataclass
 from fastapi import WebSocket
 
+from backend import fast_json
 from backend.event_bus import EventBus
 from backend.models import Event, EventType
 
+try:
+    import pybase64
+except ImportError:  # pybase64 is optional
+    pybase64 = None
+
 logger = logging.getLogger(__name__)
 
+# Event type strings, resolved once instead of through Enum .value per event
+_PLAYBACK_STARTED = EventType.PLAYBACK_STARTED.value
+_PLAYBACK_COMPLETE = EventType.PLAYBACK_COMPLETE.value
+_PLAYBACK_ERROR = EventType.PLAYBACK_ERROR.value
+
+if pybase64 is not None:
+    # SIMD encoder that returns str directly (no bytes -> str decode)
+    _b64encode = pybase64.b64encode_as_string
+else:
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+# Binary audio frame header (little-endian, 16 bytes):
+# magic u32, request id hash u64, sequence u16, total chunks u16
+AUDIO_FRAME_MAGIC = 0x30445541  # b"AUD0"
+AUDIO_FRAME_HEADER = struct.Struct("<IQHH")
+
+
+def request_hash(request_id: Optional[str]) -> int:
+    """64-bit request id hash carried in binary audio frame headers"""
+    digest = hashlib.blake2b((request_id or "").encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
 
 @dataclass
 class PlaybackConfig:
-    """Configuration for audio playback"""
-    chunk_size: int = 4096  # Bytes per WebSocket message
+    """
+    Configuration for audio playback.
+    
+    chunk_size should be a multiple of 3 (and of 2 for PCM16 alignment).
+    base64 turns every 3 bytes into 4 characters, so chunks that size never
+    carry "=" padding except the last one: the base64 chunks of a stream
+    concatenate into valid base64, and the sender can encode the whole
+    buffer once and slice it. Other sizes still work but are encoded
+    chunk by chunk.
+    """
+    # Bytes per WebSocket message (4092 = 6 * 682)
+    chunk_size: int = 4092
     buffer_size: int = 16384  # ESP32 buffer size
     stream_timeout: float = 10.0
+    # Chunks sent back-to-back before yielding to other tasks
+    send_batch: int = 8
+    # Payloads at least this large are base64-encoded in a worker thread
+    offload_threshold: int = 64 * 1024
+    
+    def __post_init__(self):
+        """Warn about chunk sizes that defeat one-shot encoding"""
+        if self.chunk_size % 3:
+            logger.warning(
+                f"chunk_size={self.chunk_size} is not a multiple of 3; "
+                "audio will be base64-encoded per chunk with mid-stream padding"
+            )
 
 
 class AudioPlaybackCoordinator:
@@ -49,8 +102,14 @@ class AudioPlaybackCoordinator:
         # Track active playback per device
         self.active_playback: Dict[str, str] = {}  # device_id -> request_id
         
-        # Store WebSocket connections per device
-        self.device_connections: Dict[str, WebSocket] = {}
+        # Store WebSocket connections and send locks per device
+        self.device_connections: Dict[str, Tuple[WebSocket, asyncio.Lock]] = {}
+        
+        # Devices that accept raw binary audio frames
+        self.binary_devices: Set[str] = set()
+        
+        # Event publishes running alongside the audio stream
+        self._inflight_emits: Set[asyncio.Task] = set()
         
         logger.info("AudioPlaybackCoordinator initialized")
     
@@ -73,18 +132,26 @@ class AudioPlaybackCoordinator:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        await self._flush_emits()
         logger.info("AudioPlaybackCoordinator stopped")
     
-    def register_device(self, device_id: str, websocket: WebSocket):
+    def register_device(self, device_id: str, websocket: WebSocket, binary_audio: bool = False):
         """
         Register a device WebSocket connection.
         
         Args:
             device_id: Device identifier
             websocket: WebSocket connection
+            binary_audio: Device accepts raw binary audio frames instead
+                of base64 JSON chunks
         """
-        self.device_connections[device_id] = websocket
-        logger.info(f"Device registered: {device_id}")
+        # Each device gets a send lock so streams to it never interleave
+        self.device_connections[device_id] = (websocket, asyncio.Lock())
+        if binary_audio:
+            self.binary_devices.add(device_id)
+        else:
+            self.binary_devices.discard(device_id)
+        logger.info(f"Device registered: {device_id} (binary_audio={binary_audio})")
     
     def unregister_device(self, device_id: str):
         """
@@ -93,10 +160,9 @@ class AudioPlaybackCoordinator:
         Args:
             device_id: Device identifier
         """
-        if device_id in self.device_connections:
-            del self.device_connections[device_id]
-        if device_id in self.active_playback:
-            del self.active_playback[device_id]
+        self.device_connections.pop(device_id, None)
+        self.binary_devices.discard(device_id)
+        self.active_playback.pop(device_id, None)
         logger.info(f"Device unregistered: {device_id}")
     
     async def _listen_for_audio_ready(self):
@@ -121,35 +187,37 @@ class AudioPlaybackCoordinator:
         """
         device_id = event.data.get("device_id", "unknown")
         request_id = event.req_id
+        audio_stream = event.data.get("audio_stream")
         
         logger.info(f"Audio ready for device {device_id}, req_id={request_id}")
         
-        # Check if playback is already active for this device
-        if self._is_playback_active(device_id):
-            logger.warning(
-                f"Playback already active for device {device_id}, "
-                f"ignoring new request {request_id}"
-            )
-            return
-        
-        # Check if device is connected
-        if device_id not in self.device_connections:
-            logger.error(f"Device {device_id} not connected, cannot stream audio")
-            await self._emit_playback_error(device_id, request_id, "Device not connected")
-            return
-        
-        # Stream audio to device
         try:
-            await self._stream_audio(
-                audio_data=event.data.get("audio_data", b""),
-                device_id=device_id,
-                request_id=request_id,
-                audio_format=event.data.get("audio_format", "pcm"),
-                sample_rate=event.data.get("sample_rate", 16000)
-            )
-        except Exception as e:
-            logger.error(f"Audio streaming failed: {e}")
-            await self._emit_playback_error(device_id, request_id, str(e))
+            # Check if playback is already active for this device
+            if self._is_playback_active(device_id):
+                logger.warning(
+                    f"Playback already active for device {device_id}, "
+                    f"ignoring new request {request_id}"
+                )
+                return
+            
+            # Stream audio to device (fails with a playback error if not connected)
+            try:
+                await self._stream_audio(
+                    audio_data=event.data.get("audio_data", b""),
+                    device_id=device_id,
+                    request_id=request_id,
+                    audio_format=event.data.get("audio_format", "pcm"),
+                    sample_rate=event.data.get("sample_rate", 16000),
+                    audio_stream=audio_stream
+                )
+            except Exception as e:
+                logger.error(f"Audio streaming failed: {e}")
+                await self._emit_playback_error(device_id, request_id, str(e))
+        finally:
+            # The event stays in bus history, so a skipped or abandoned stream
+            # would otherwise keep its producer (and TTS connection) suspended
+            if audio_stream is not None and hasattr(audio_stream, "aclose"):
+                await audio_stream.aclose()
     
     async def _stream_audio(
         self,
@@ -157,7 +225,8 @@ class AudioPlaybackCoordinator:
         device_id: str,
         request_id: str,
         audio_format: str,
-        sample_rate: int
+        sample_rate: int,
+        audio_stream: Optional[AsyncIterator[bytes]] = None
     ):
         """
         Stream audio chunks to ESP32 via WebSocket.
@@ -168,69 +237,282 @@ class AudioPlaybackCoordinator:
             request_id: Request identifier
             audio_format: Audio format (pcm, mp3)
             sample_rate: Sample rate in Hz
+            audio_stream: Audio still being produced; when given, chunks are
+                forwarded as they arrive and audio_data is ignored
         """
-        websocket = self.device_connections.get(device_id)
-        if not websocket:
+        # One lookup: the stream keeps this socket even if the device re-registers
+        connection = self.device_connections.get(device_id)
+        if connection is None:
             raise Exception(f"Device {device_id} not connected")
+        websocket, send_lock = connection
         
-        # Mark playback as active
-        self.active_playback[device_id] = request_id
-        
-        # Emit playback started event
-        await self._emit_playback_started(device_id, request_id)
-        
-        try:
-            # Calculate total chunks
-            total_chunks = (len(audio_data) + self.config.chunk_size - 1) // self.config.chunk_size
+        async with send_lock:
+            # Mark playback as active
+            self.active_playback[device_id] = request_id
             
-            logger.info(
-                f"Streaming {len(audio_data)} bytes in {total_chunks} chunks "
-                f"to device {device_id}"
-            )
+            # Emit playback started event
+            # Published concurrently so it does not delay the first chunk
+            self._emit_soon(self._emit_playback_started(device_id, request_id))
             
-            # Stream chunks
-            for i in range(0, len(audio_data), self.config.chunk_size):
-                chunk = audio_data[i:i + self.config.chunk_size]
-                sequence = i // self.config.chunk_size
+            try:
+                if audio_stream is not None:
+                    await self._send_streamed(
+                        websocket, device_id, audio_stream, request_id, audio_format, sample_rate
+                    )
+                else:
+                    await self._send_buffered(
+                        websocket, device_id, audio_data, request_id, audio_format, sample_rate
+                    )
                 
-                # Create WebSocket message
-                message = {
-                    "type": "audio_chunk",
-                    "request_id": request_id,
-                    "audio_data": base64.b64encode(chunk).decode(),
-                    "sequence": sequence,
-                    "total_chunks": total_chunks,
-                    "format": audio_format,
-                    "sample_rate": sample_rate
-                }
+                logger.info(f"Audio streaming complete for request {request_id}")
                 
-                # Send chunk
-                try:
-                    await asyncio.wait_for(
-                        websocket.send_json(message),
-                        timeout=self.config.stream_timeout
-                    )
-                    logger.debug(f"Sent chunk {sequence + 1}/{total_chunks}")
-                    
-                    # Small delay to prevent overwhelming ESP32
-                    await asyncio.sleep(0.01)
-                    
-                except asyncio.TimeoutError:
-                    raise Exception(f"Timeout sending chunk {sequence}")
-                except Exception as e:
-                    raise Exception(f"Failed to send chunk {sequence}: {e}")
+                # Note: Playback complete event will be sent by ESP32
+                # when it finishes playing the audio
             
-            logger.info(f"Audio streaming complete for request {request_id}")
+            except Exception as e:
+                logger.error(f"Audio streaming error: {e}")
+                # Clear active playback on error
+                self.active_playback.pop(device_id, None)
+                raise
+    
+    async def _send_buffered(
+        self,
+        websocket: WebSocket,
+        device_id: str,
+        audio_data: bytes,
+        request_id: str,
+        audio_format: str,
+        sample_rate: int
+    ):
+        """Send fully materialized audio, with total_chunks known up front"""
+        # Calculate total chunks
+        total_chunks = (len(audio_data) + self.config.chunk_size - 1) // self.config.chunk_size
+        
+        logger.info(
+            f"Streaming {len(audio_data)} bytes in {total_chunks} chunks "
+            f"to device {device_id}"
+        )
+        
+        if device_id in self.binary_devices:
+            # Metadata once as JSON, then raw PCM frames with a small header
+            await self._send_begin(websocket, request_id, total_chunks, audio_format, sample_rate)
+            
+            frames = self._binary_frames(audio_data, request_id, total_chunks)
+            for sequence, frame in enumerate(frames):
+                await self._send_frame(websocket.send_bytes, frame, sequence)
+                
+                # Let other tasks run between batches of chunks
+                if (sequence + 1) % self.config.send_batch == 0:
+                    await asyncio.sleep(0)
+        else:
+            # Legacy protocol: base64 audio inside a JSON message per chunk.
+            # One message dict is reused; only the per-chunk fields change.
+            message = self._chunk_message(request_id, total_chunks, audio_format, sample_rate)
             
-            # Note: Playback complete event will be sent by ESP32
-            # when it finishes playing the audio
+            # Encoding a long clip inline would stall every other connection
+            encoded = None
+            if (
+                self.config.chunk_size % 3 == 0
+                and len(audio_data) >= self.config.offload_threshold
+            ):
+                encoded = await asyncio.to_thread(_b64encode, audio_data)
             
+            for sequence, encoded_chunk in enumerate(
+                self._encode_chunks(audio_data, self.config.chunk_size, encoded)
+            ):
+                message["audio_data"] = encoded_chunk
+                message["sequence"] = sequence
+                await self._send_frame(websocket.send_text, fast_json.dumps(message), sequence)
+                
+                # Let other tasks run between batches of chunks
+                if (sequence + 1) % self.config.send_batch == 0:
+                    await asyncio.sleep(0)
+    
+    async def _send_streamed(
+        self,
+        websocket: WebSocket,
+        device_id: str,
+        audio_stream: AsyncIterator[bytes],
+        request_id: str,
+        audio_format: str,
+        sample_rate: int
+    ):
+        """
+        Forward audio as the producer generates it.
+        
+        The total is unknown until the stream ends, so chunks carry
+        total_chunks=None (0 in binary headers) and an audio_end message
+        with the final count closes the stream.
+        """
+        logger.info(f"Streaming incremental audio to device {device_id}")
+        
+        binary = device_id in self.binary_devices
+        if binary:
+            await self._send_begin(websocket, request_id, None, audio_format, sample_rate)
+            req_hash = request_hash(request_id)
+        else:
+            message = self._chunk_message(request_id, None, audio_format, sample_rate)
+        
+        sequence = 0
+        async for chunk in self._rechunk(audio_stream):
+            if binary:
+                header = AUDIO_FRAME_HEADER.pack(AUDIO_FRAME_MAGIC, req_hash, sequence, 0)
+                await self._send_frame(websocket.send_bytes, header + chunk, sequence)
+            else:
+                message["audio_data"] = _b64encode(chunk)
+                message["sequence"] = sequence
+                await self._send_frame(websocket.send_text, fast_json.dumps(message), sequence)
+            sequence += 1
+        
+        end_message = {
+            "type": "audio_end",
+            "request_id": request_id,
+            "total_chunks": sequence
+        }
+        await self._send_frame(websocket.send_text, fast_json.dumps(end_message), "audio_end")
+    
+    async def _rechunk(self, audio_stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Regroup producer output of any size into chunk_size pieces.
+        
+        Whole chunks are sliced straight out of each piece via memoryview;
+        only the remainder that straddles two pieces is copied.
+        """
+        chunk_size = self.config.chunk_size
+        pending = bytearray()
+        async for piece in audio_stream:
+            view = memoryview(piece)
+            start = 0
+            if pending:
+                start = min(chunk_size - len(pending), len(view))
+                pending += view[:start]
+                if len(pending) < chunk_size:
+                    continue
+                yield bytes(pending)
+                pending.clear()
+            while len(view) - start >= chunk_size:
+                yield view[start:start + chunk_size]
+                start += chunk_size
+            pending += view[start:]
+        
+        if pending:
+            yield bytes(pending)
+    
+    def _chunk_message(
+        self,
+        request_id: str,
+        total_chunks: Optional[int],
+        audio_format: str,
+        sample_rate: int
+    ) -> Dict:
+        """Build the reusable audio_chunk message for the JSON protocol"""
+        return {
+            "type": "audio_chunk",
+            "request_id": request_id,
+            "audio_data": "",
+            "sequence": 0,
+            "total_chunks": total_chunks,
+            "format": audio_format,
+            "sample_rate": sample_rate
+        }
+    
+    async def _send_begin(
+        self,
+        websocket: WebSocket,
+        request_id: str,
+        total_chunks: Optional[int],
+        audio_format: str,
+        sample_rate: int
+    ):
+        """Send the audio_begin metadata frame for the binary protocol"""
+        begin_message = {
+            "type": "audio_begin",
+            "request_id": request_id,
+            "request_hash": request_hash(request_id),
+            "total_chunks": total_chunks,
+            "chunk_size": self.config.chunk_size,
+            "format": audio_format,
+            "sample_rate": sample_rate
+        }
+        await self._send_frame(websocket.send_text, fast_json.dumps(begin_message), "audio_begin")
+    
+    async def _send_frame(self, send, payload, sequence) -> None:
+        """
+        Send one frame with the stream timeout.
+        
+        The awaited send applies the transport's flow control, so a slow
+        ESP32 throttles the stream instead of a fixed delay.
+        
+        Args:
+            send: websocket.send_text or websocket.send_bytes
+            payload: Frame payload
+            sequence: Chunk sequence (or frame name) for logs and errors
+        """
+        try:
+            await asyncio.wait_for(send(payload), timeout=self.config.stream_timeout)
+            logger.debug(f"Sent chunk {sequence}")
+        except asyncio.TimeoutError:
+            raise Exception(f"Timeout sending chunk {sequence}")
         except Exception as e:
-            logger.error(f"Audio streaming error: {e}")
-            # Clear active playback on error
-            if device_id in self.active_playback:
-                del self.active_playback[device_id]
-            raise
+            raise Exception(f"Failed to send chunk {sequence}: {e}")
+    
+    def _binary_frames(
+        self,
+        audio_data: bytes,
+        request_id: Optional[str],
+        total_chunks: int
+    ) -> Iterator[bytes]:
+        """
+        Split audio into binary frames of header + raw PCM.
+        
+        Args:
+            audio_data: Audio data to split
+            request_id: Request identifier (hashed into each header)
+            total_chunks: Number of chunks in the stream
+        
+        Yields:
+            Frame bytes, in order
+        """
+        chunk_size = self.config.chunk_size
+        req_hash = request_hash(request_id)
+        view = memoryview(audio_data)
+        for sequence, start in enumerate(range(0, len(audio_data), chunk_size)):
+            header = AUDIO_FRAME_HEADER.pack(AUDIO_FRAME_MAGIC, req_hash, sequence, total_chunks)
+            yield header + view[start:start + chunk_size]
+    
+    @staticmethod
+    def _encode_chunks(
+        audio_data: bytes,
+        chunk_size: int,
+        encoded: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Base64-encode audio split into chunk_size pieces.
+        
+        base64 maps every 3 input bytes to 4 output chars, so when chunk_size
+        is a multiple of 3 the buffer is encoded once and the string sliced;
+        otherwise each chunk is encoded separately.
+        
+        Args:
+            audio_data: Audio data to encode
+            chunk_size: Raw bytes per chunk
+            encoded: Base64 of the whole of audio_data if already computed
+                (used only when chunk_size is a multiple of 3)
+        
+        Yields:
+            Base64 text of each chunk, in order
+        """
+        if chunk_size % 3 == 0:
+            if encoded is None:
+                encoded = _b64encode(audio_data)
+            step = chunk_size // 3 * 4
+            for start in range(0, len(encoded), step):
+                yield encoded[start:start + step]
+        else:
+            # Zero-copy slices; both base64 encoders accept buffer objects
+            view = memoryview(audio_data)
+            for start in range(0, len(view), chunk_size):
+                yield _b64encode(view[start:start + chunk_size])
     
     async def on_playback_complete(self, device_id: str, request_id: str):
         """
@@ -243,8 +525,7 @@ class AudioPlaybackCoordinator:
         logger.info(f"Playback complete: device={device_id}, req_id={request_id}")
         
         # Clear active playback
-        if device_id in self.active_playback:
-            del self.active_playback[device_id]
+        self.active_playback.pop(device_id, None)
         
         # Emit playback complete event
         await self._emit_playback_complete(device_id, request_id)
@@ -261,6 +542,37 @@ class AudioPlaybackCoordinator:
         """
         return device_id in self.active_playback
     
+    @staticmethod
+    def _mk_event(event_type: str, request_id: str, data: Dict) -> Event:
+        """
+        Build a playback event stamped with the current wall-clock time.
+        
+        Args:
+            event_type: Event type
+            request_id: Request identifier
+            data: Event payload
+        
+        Returns:
+            New Event
+        """
+        return Event(event_type, time.time(), request_id, data)
+    
+    def _emit_soon(self, emit: Awaitable[None]):
+        """
+        Run an emit coroutine in the background, keeping a reference to it.
+        
+        Args:
+            emit: Emit coroutine to schedule
+        """
+        task = asyncio.create_task(emit)
+        self._inflight_emits.add(task)
+        task.add_done_callback(self._inflight_emits.discard)
+    
+    async def _flush_emits(self):
+        """Wait for background emits so later events are published after them"""
+        if self._inflight_emits:
+            await asyncio.gather(*self._inflight_emits, return_exceptions=True)
+    
     async def _emit_playback_started(self, device_id: str, request_id: str):
         """
         Emit playback started event.
@@ -269,16 +581,9 @@ class AudioPlaybackCoordinator:
             device_id: Device identifier
             request_id: Request identifier
         """
-        event = Event(
-            event_type=EventType.PLAYBACK_STARTED.value,
-            timestamp=asyncio.get_event_loop().time(),
-            req_id=request_id,
-            data={
-                "device_id": device_id
-            }
+        await self.event_bus.publish(
+            self._mk_event(_PLAYBACK_STARTED, request_id, {"device_id": device_id})
         )
-        
-        await self.event_bus.publish(event)
         logger.info(f"Playback started event emitted: req_id={request_id}")
     
     async def _emit_playback_complete(self, device_id: str, request_id: str):
@@ -289,16 +594,10 @@ class AudioPlaybackCoordinator:
             device_id: Device identifier
             request_id: Request identifier
         """
-        event = Event(
-            event_type=EventType.PLAYBACK_COMPLETE.value,
-            timestamp=asyncio.get_event_loop().time(),
-            req_id=request_id,
-            data={
-                "device_id": device_id
-            }
+        await self._flush_emits()
+        await self.event_bus.publish(
+            self._mk_event(_PLAYBACK_COMPLETE, request_id, {"device_id": device_id})
         )
-        
-        await self.event_bus.publish(event)
         logger.info(f"Playback complete event emitted: req_id={request_id}")
     
     async def _emit_playback_error(self, device_id: str, request_id: str, error: str):
@@ -310,17 +609,12 @@ class AudioPlaybackCoordinator:
             request_id: Request identifier
             error: Error message
         """
-        event = Event(
-            event_type=EventType.PLAYBACK_ERROR.value,
-            timestamp=asyncio.get_event_loop().time(),
-            req_id=request_id,
-            data={
-                "device_id": device_id,
-                "error": error
-            }
+        await self._flush_emits()
+        await self.event_bus.publish(
+            self._mk_event(
+                _PLAYBACK_ERROR, request_id, {"device_id": device_id, "error": error}
+            )
         )
-        
-        await self.event_bus.publish(event)
         logger.error(f"Playback error event emitted: req_id={request_id}, error={error}")
     
     def get_stats(self) -> Dict:
@@ -329,5 +623,6 @@ class AudioPlaybackCoordinator:
             "running": self._running,
             "active_playback_count": len(self.active_playback),
             "connected_devices": len(self.device_connections),
+            "binary_audio_devices": len(self.binary_devices),
             "active_playback": dict(self.active_playback)
         }
@@ -0,0 +1,96 @@
+# Debounced batching of blocking file I/O onto worker threads
+import asyncio
+import logging
+from typing import Any, Callable, Generic, List, Optional, Set, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Runs a whole batch in a worker thread; returns one result or exception per item
+BatchFunc = Callable[[List[T]], List[Union[Any, Exception]]]
+
+
+class BatchedIO(Generic[T]):
+    """
+    Serves blocking I/O calls from worker threads in batches.
+    
+    Requests made within a short debounce window are collected and handed
+    to a single worker-thread hop, so bursty traffic pays one executor
+    round-trip per batch instead of one per file. Subclasses supply the
+    batch function and a typed public method that calls _submit().
+    """
+    
+    def __init__(
+        self,
+        batch_func: BatchFunc,
+        max_batch: int = 32,
+        debounce_seconds: float = 0.001,
+        label: str = "I/O"
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            batch_func: Blocking function run in a worker thread per batch
+            max_batch: Maximum number of requests served by one worker hop
+            debounce_seconds: How long to wait for more requests before flushing
+            label: Operation name used in log messages
+        """
+        self._batch_func = batch_func
+        self.max_batch = max_batch
+        self.debounce_seconds = debounce_seconds
+        self._label = label
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+    
+    async def _submit(self, item: T) -> Any:
+        """Queue one request and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.debounce_seconds, self._flush)
+        
+        return await future
+    
+    async def close(self) -> None:
+        """Flush pending requests and wait for all in-flight batches to finish"""
+        self._flush()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+    
+    def _flush(self) -> None:
+        """Hand all pending requests to worker threads, max_batch at a time"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        pending, self._pending = self._pending, []
+        for i in range(0, len(pending), self.max_batch):
+            task = asyncio.create_task(self._run_batch(pending[i:i + self.max_batch]))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """Run one batch in a worker thread and resolve its futures"""
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.to_thread(self._batch_func, items)
+        except Exception as e:
+            logger.error(f"Batched {self._label} failed: {e}")
+            results = [e] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        
+        logger.debug(f"Batched {self._label}: {len(batch)} files")
@@ -2,14 +2,88 @@
 import asyncio
 import time
 import logging
-from typing import Optional, Dict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
 from backend.models import Event, EventType, RequestState
 from backend.event_bus import EventBus
-from PIL import Image
-import io
 
 logger = logging.getLogger(__name__)
 
+# Start-of-frame markers (baseline, progressive, lossless, ...); 0xC4 (DHT),
+# 0xC8 (JPG) and 0xCC (DAC) share the range but are not frame headers
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(buf: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG's start-of-frame header.
+    
+    Walks the marker segments only, so it touches a few hundred bytes
+    rather than decoding the image.
+    
+    Args:
+        buf: JPEG data
+    
+    Returns:
+        (width, height), or None if no frame header could be found
+    """
+    if buf[:2] != b"\xff\xd8":
+        return None
+    
+    i = 2
+    size = len(buf)
+    while i + 4 <= size:
+        if buf[i] != 0xFF:
+            return None
+        marker = buf[i + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            # Standalone markers have no length field
+            i += 2
+            continue
+        if marker in (0xD9, 0xDA):
+            # End of image / start of scan before any frame header
+            return None
+        
+        seg_len = int.from_bytes(buf[i + 2:i + 4], "big")
+        if marker in _SOF_MARKERS:
+            if i + 9 > size:
+                return None
+            height = int.from_bytes(buf[i + 5:i + 7], "big")
+            width = int.from_bytes(buf[i + 7:i + 9], "big")
+            return width, height
+        i += 2 + seg_len
+    
+    return None
+
+
+def _pil_dimensions(buf: bytes) -> Tuple[int, int]:
+    """Fallback size check via Pillow, imported only when actually needed"""
+    import io
+    from PIL import Image
+    return Image.open(io.BytesIO(buf)).size
+
+
+@dataclass(slots=True)
+class CaptureSlot:
+    """Wait slot for one pending capture, recycled across requests"""
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+    image: Optional[bytes] = None
+    trigger_text: str = ""
+    retries: int = 0
+    cancelled: bool = False
+    
+    def reset(self) -> None:
+        """Clear per-request state before reuse"""
+        self.event.clear()
+        self.image = None
+        self.trigger_text = ""
+        self.retries = 0
+        self.cancelled = False
+
 
 class CaptureCoordinator:
     """
@@ -17,90 +91,114 @@ class CaptureCoordinator:
     Manages timeouts and validates received images.
     """
     
-    def __init__(self, event_bus: EventBus, timeout_seconds: int = 5):
+    def __init__(self, event_bus: EventBus, timeout_seconds: int = 5, max_retries: int = 0):
         self.event_bus = event_bus
         self.timeout_seconds = timeout_seconds
-        self.pending_captures: Dict[str, asyncio.Future] = {}
+        # Extra CAPTURE requests sent after a timeout before giving up
+        self.max_retries = max_retries
+        self.pending_captures: Dict[str, CaptureSlot] = {}
+        # Released slots kept for reuse
+        self._slot_pool: List[CaptureSlot] = []
+        self.max_pooled_slots = 8
         self.state = RequestState.LISTENING.value
         
-        logger.info(f"CaptureCoordinator initialized with {timeout_seconds}s timeout")
+        logger.info(
+            f"CaptureCoordinator initialized with {timeout_seconds}s timeout, "
+            f"{max_retries} retries"
+        )
     
-    async def request_capture(self, req_id: str, trigger_text: str) -> None:
+    async def request_capture(self, req_id: str, trigger_text: str, attempt: int = 0) -> None:
         """
         Send CAPTURE command to ESP32.
         
         Args:
             req_id: Request ID
             trigger_text: Original trigger text
+            attempt: Retry number (0 for the first request)
         """
-        self.state = RequestState.CAPTURE_REQUESTED.value
+        self.state = RequestState.CAPTURING.value
+        
+        # Register the slot first so an immediate reply is not missed;
+        # a retry reuses the request's existing slot
+        slot = self.pending_captures.get(req_id)
+        if slot is None:
+            slot = self._slot_pool.pop() if self._slot_pool else CaptureSlot()
+            self.pending_captures[req_id] = slot
+        slot.reset()
+        slot.trigger_text = trigger_text
+        slot.retries = attempt
         
         # Create capture request event
         event = Event(
             event_type=EventType.CAPTURE_REQUESTED.value,
             timestamp=time.time(),
             req_id=req_id,
-            data={"trigger_text": trigger_text}
+            data={"trigger_text": trigger_text, "attempt": attempt}
         )
         
         await self.event_bus.publish(event)
-        logger.info(f"Capture requested: req_id={req_id}")
-        
-        # Create future for waiting
-        future = asyncio.Future()
-        self.pending_captures[req_id] = future
+        logger.info(f"Capture requested: req_id={req_id}, attempt={attempt}")
         
         self.state = RequestState.WAITING_IMAGE.value
     
     async def wait_for_image(self, req_id: str) -> Optional[bytes]:
         """
-        Wait for image from ESP32 with timeout.
+        Wait for image from ESP32 with timeout, re-requesting up to max_retries times.
         
         Args:
             req_id: Request ID to wait for
             
         Returns:
-            Image bytes if received, None if timeout
+            Image bytes if received, None if timeout or cancelled
         """
-        if req_id not in self.pending_captures:
+        slot = self.pending_captures.get(req_id)
+        if slot is None:
             logger.error(f"No pending capture for req_id={req_id}")
             return None
         
-        future = self.pending_captures[req_id]
-        
         try:
-            # Wait with timeout
-            image_bytes = await asyncio.wait_for(future, timeout=self.timeout_seconds)
-            logger.info(f"Image received for req_id={req_id}")
-            self.state = RequestState.DONE.value
-            return image_bytes
-            
-        except asyncio.TimeoutError:
-            logger.error(f"Capture timeout for req_id={req_id}")
-            self.state = RequestState.ERROR.value
-            
-            # Publish timeout error event
-            error_event = Event(
-                event_type=EventType.ERROR.value,
-                timestamp=time.time(),
-                req_id=req_id,
-                data={
-                    "error_type": "capture_timeout",
-                    "message": f"ESP32 未在 {self.timeout_seconds} 秒內回應影像"
-                }
-            )
-            await self.event_bus.publish(error_event)
-            
-            return None
-            
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await asyncio.wait_for(slot.event.wait(), timeout=self.timeout_seconds)
+                except asyncio.TimeoutError:
+                    if attempt == self.max_retries:
+                        break
+                    logger.warning(
+                        f"Capture timeout for req_id={req_id}, "
+                        f"retrying ({attempt + 1}/{self.max_retries})"
+                    )
+                    await self.request_capture(req_id, slot.trigger_text, attempt + 1)
+                    continue
+                
+                if slot.cancelled:
+                    logger.info(f"Capture wait cancelled: req_id={req_id}")
+                    return None
+                
+                logger.info(f"Image received for req_id={req_id}")
+                self.state = RequestState.LISTENING.value
+                return slot.image
         finally:
             # Clean up
-            if req_id in self.pending_captures:
+            if self.pending_captures.get(req_id) is slot:
                 del self.pending_captures[req_id]
-            
-            # Reset state
-            if self.state != RequestState.ERROR.value:
-                self.state = RequestState.LISTENING.value
+            self._recycle(slot)
+        
+        logger.error(f"Capture timeout for req_id={req_id}")
+        self.state = RequestState.ERROR.value
+        
+        # Publish timeout error event
+        error_event = Event(
+            event_type=EventType.ERROR.value,
+            timestamp=time.time(),
+            req_id=req_id,
+            data={
+                "error_type": "capture_timeout",
+                "message": f"ESP32 未在 {self.timeout_seconds} 秒內回應影像"
+            }
+        )
+        await self.event_bus.publish(error_event)
+        
+        return None
     
     def receive_image(self, req_id: str, image_bytes: bytes) -> bool:
         """
@@ -119,23 +217,30 @@ class CaptureCoordinator:
             return False
         
         # Check if we're waiting for this image
-        if req_id not in self.pending_captures:
+        slot = self.pending_captures.get(req_id)
+        if slot is None:
             logger.warning(f"Received unexpected image for req_id={req_id}")
             return False
         
-        # Fulfill the future
-        future = self.pending_captures[req_id]
-        if not future.done():
-            future.set_result(image_bytes)
+        # Fill the slot and wake the waiter
+        if not slot.event.is_set():
+            slot.image = image_bytes
+            slot.event.set()
             logger.info(f"Image accepted for req_id={req_id}")
             return True
         else:
-            logger.warning(f"Future already completed for req_id={req_id}")
+            logger.warning(f"Capture already completed for req_id={req_id}")
             return False
     
+    def _recycle(self, slot: CaptureSlot) -> None:
+        """Return a finished slot to the pool"""
+        slot.reset()
+        if len(self._slot_pool) < self.max_pooled_slots:
+            self._slot_pool.append(slot)
+    
     def validate_image(self, image_bytes: bytes) -> bool:
         """
-        Validate image size and format.
+        Validate image size, JPEG framing and resolution.
         
         Args:
             image_bytes: Image data to validate
@@ -149,10 +254,20 @@ class CaptureCoordinator:
             logger.error(f"Image too large: {len(image_bytes)} bytes (max {max_size})")
             return False
         
-        # Try to open image and check resolution
+        # ESP32 cameras only send JPEG: require SOI magic and EOI trailer
+        if len(image_bytes) < 4 or image_bytes[0] != 0xFF or image_bytes[1] != 0xD8:
+            logger.error("Invalid image: missing JPEG start-of-image marker")
+            return False
+        if image_bytes[-2:] != b"\xff\xd9":
+            logger.error("Invalid image: missing JPEG end-of-image marker (truncated?)")
+            return False
+        
+        # Check resolution from the JPEG header; Pillow only as a fallback
         try:
-            img = Image.open(io.BytesIO(image_bytes))
-            width, height = img.size
+            dimensions = _jpeg_dimensions(image_bytes)
+            if dimensions is None:
+                dimensions = _pil_dimensions(image_bytes)
+            width, height = dimensions
             
             # Check resolution (max 640x480)
             if width > 640 or height > 480:
@@ -168,11 +283,11 @@ class CaptureCoordinator:
     
     def cancel_request(self, req_id: str) -> None:
         """Cancel pending capture request"""
-        if req_id in self.pending_captures:
-            future = self.pending_captures[req_id]
-            if not future.done():
-                future.cancel()
-            del self.pending_captures[req_id]
+        slot = self.pending_captures.pop(req_id, None)
+        if slot is not None:
+            # Wake the waiter, which returns None and recycles the slot
+            slot.cancelled = True
+            slot.event.set()
             logger.info(f"Capture request cancelled: req_id={req_id}")
         
         self.state = RequestState.LISTENING.value
@@ -1,7 +1,8 @@
 # Configuration management for ESP32 ASR Capture Vision MVP
 import os
-from typing import Optional
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from typing import Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 import logging
 
@@ -11,12 +12,19 @@ logger = logging.getLogger(__name__)
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
     
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False
+    )
+    
     # ASR Service
     asr_api_key: str = Field(..., env="ASR_API_KEY")
     asr_endpoint: str = Field(
         default="wss://dashscope.aliyuncs.com/api/v1/services/audio/asr",
         env="ASR_ENDPOINT"
     )
+    asr_flush_threshold: int = Field(default=6400, env="ASR_FLUSH_THRESHOLD")
     
     # Vision Model
     vision_api_key: str = Field(..., env="VISION_API_KEY")
@@ -65,21 +73,41 @@ class Settings(BaseSettings):
     trigger_fuzzy_threshold: float = Field(default=0.85, env="TRIGGER_FUZZY_THRESHOLD")
     
     # Audio Playback Configuration
-    audio_chunk_size: int = Field(default=4096, env="AUDIO_CHUNK_SIZE")
+    # Keep a multiple of 6: padding-free base64 chunks, whole PCM16 samples
+    audio_chunk_size: int = Field(default=4092, env="AUDIO_CHUNK_SIZE")
     audio_buffer_size: int = Field(default=16384, env="AUDIO_BUFFER_SIZE")
     audio_stream_timeout: float = Field(default=10.0, env="AUDIO_STREAM_TIMEOUT")
     
     # AWS EC2 Configuration
     public_url: Optional[str] = Field(default=None, env="PUBLIC_URL")
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    @cached_property
+    def english_trigger_phrases(self) -> Tuple[str, ...]:
+        """English trigger phrases parsed from TRIGGER_ENGLISH_PHRASES"""
+        return _split_phrases(self.trigger_english_phrases)
+    
+    @cached_property
+    def chinese_trigger_phrases(self) -> Tuple[str, ...]:
+        """Chinese trigger phrases parsed from TRIGGER_CHINESE_PHRASES"""
+        return _split_phrases(self.trigger_chinese_phrases)
+
+
+# Placeholder values from .env.example and the setup docs
+_PLACEHOLDER_KEYS = frozenset({
+    "your_dashscope_api_key_here",
+    "your_vision_api_key_here",
+    "your_tts_api_key_here",
+})
+
+
+def _split_phrases(value: str) -> Tuple[str, ...]:
+    """Split a comma-separated phrase list, dropping empty entries"""
+    return tuple(p.strip() for p in value.split(',') if p.strip())
 
 
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
-    """Load and validate settings"""
+    """Load and validate settings (parsed once; later calls return the same instance)"""
     try:
         settings = Settings()
         logger.info("Configuration loaded successfully")
@@ -89,19 +117,26 @@ def load_settings() -> Settings:
         raise
 
 
+def reset_settings() -> None:
+    """Drop the cached settings so the next load_settings() re-reads the environment"""
+    load_settings.cache_clear()
+
+
+def api_key_configured(key: Optional[str]) -> bool:
+    """Check that an API key is set and is not a documented placeholder"""
+    return bool(key) and key not in _PLACEHOLDER_KEYS
+
+
 def validate_api_keys(settings: Settings) -> bool:
     """Validate that required API keys are present"""
-    if not settings.asr_api_key or settings.asr_api_key == "your_dashscope_api_key_here":
-        logger.error("ASR_API_KEY is not configured")
-        return False
-    
-    if not settings.vision_api_key or settings.vision_api_key == "your_vision_api_key_here":
-        logger.error("VISION_API_KEY is not configured")
-        return False
-    
-    if not settings.tts_api_key or settings.tts_api_key == "your_tts_api_key_here":
-        logger.error("TTS_API_KEY is not configured")
-        return False
+    for env_name, key in (
+        ("ASR_API_KEY", settings.asr_api_key),
+        ("VISION_API_KEY", settings.vision_api_key),
+        ("TTS_API_KEY", settings.tts_api_key),
+    ):
+        if not api_key_configured(key):
+            logger.error(f"{env_name} is not configured")
+            return False
     
     logger.info("API keys validated successfully")
     return True
@@ -0,0 +1,57 @@
+# Trigger cooldown shared by the trigger engines
+import time
+from typing import Optional
+
+
+class CooldownMixin:
+    """
+    Cooldown window after each trigger, timed on the monotonic clock.
+    
+    The last trigger is reported as a wall-clock time, while the window
+    itself runs on time.monotonic() so wall-clock jumps cannot stretch or
+    cut it short. Hosts call _init_cooldown() from __init__.
+    """
+    
+    _cooldown_seconds: float
+    _last_trigger_time: Optional[float]
+    _cooldown_until: float
+    
+    def _init_cooldown(self, cooldown_seconds: float) -> None:
+        """
+        Start with no trigger and no cooldown.
+        
+        Args:
+            cooldown_seconds: Length of the cooldown window
+        """
+        self._cooldown_seconds = cooldown_seconds
+        self._last_trigger_time = None
+        self._cooldown_until = float("-inf")
+    
+    def _cooldown_active(self) -> bool:
+        """Check if the cooldown window is still open"""
+        return time.monotonic() < self._cooldown_until
+    
+    def _start_cooldown(self, now: Optional[float] = None) -> None:
+        """
+        Stamp the trigger time and start the cooldown window.
+        
+        Args:
+            now: Wall-clock trigger time, if the caller already read the clock
+        """
+        self._last_trigger_time = time.time() if now is None else now
+        self._cooldown_until = time.monotonic() + self._cooldown_seconds
+    
+    @property
+    def last_trigger_time(self) -> Optional[float]:
+        """Wall-clock time of the last trigger, or None after a reset"""
+        return self._last_trigger_time
+    
+    @last_trigger_time.setter
+    def last_trigger_time(self, value: Optional[float]):
+        self._last_trigger_time = value
+        if value is None:
+            self._cooldown_until = float("-inf")
+        else:
+            # Carry the time since that trigger over to the monotonic clock
+            elapsed = time.time() - value
+            self._cooldown_until = time.monotonic() - elapsed + self._cooldown_seconds
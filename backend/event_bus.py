@@ -2,7 +2,8 @@
 import asyncio
 import time
 from collections import deque
-from typing import Dict, List, Optional, AsyncIterator, Set
+from itertools import islice
+from typing import Dict, List, Optional, AsyncIterator, Tuple
 from backend.models import Event, EventType
 import logging
 
@@ -15,6 +16,15 @@ class EventBus:
     Maintains a ring buffer of recent events for history queries.
     """
     
+    __slots__ = (
+        "buffer_size",
+        "history",
+        "_history_by_type",
+        "subscribers",
+        "_fanout",
+        "dropped_counts",
+    )
+    
     def __init__(self, buffer_size: int = 100):
         """
         Initialize event bus.
@@ -24,8 +34,14 @@ class EventBus:
         """
         self.buffer_size = buffer_size
         self.history: deque = deque(maxlen=buffer_size)
-        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
-        self._lock = asyncio.Lock()
+        # The same events indexed by type, for filtered history queries
+        self._history_by_type: Dict[str, deque] = {}
+        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+        # Typed + wildcard subscriber queues per event type, rebuilt on demand
+        # after any subscription change
+        self._fanout: Dict[str, Tuple[asyncio.Queue, ...]] = {}
+        # Events dropped from each subscriber queue because it was full
+        self.dropped_counts: Dict[asyncio.Queue, int] = {}
         logger.info(f"EventBus initialized with buffer size {buffer_size}")
     
     async def publish(self, event: Event) -> None:
@@ -35,62 +51,124 @@ class EventBus:
         Args:
             event: Event to publish
         """
-        async with self._lock:
-            # Add to history (ring buffer automatically removes oldest)
-            self.history.append(event)
+        # Add to history (ring buffer automatically removes oldest). No lock
+        # is needed: nothing here awaits, so no other task can interleave.
+        # The evicted event is also the oldest of its type, so the per-type
+        # index drops it from the left to stay in step.
+        if self.history and len(self.history) == self.history.maxlen:
+            self._history_by_type[self.history[0].event_type].popleft()
+        self.history.append(event)
+        by_type = self._history_by_type.get(event.event_type)
+        if by_type is None:
+            by_type = self._history_by_type[event.event_type] = deque(maxlen=self.buffer_size)
+        by_type.append(event)
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"Event published: {event.event_type} (req_id: {event.req_id})")
         
-        # Notify subscribers
-        event_type = event.event_type
-        if event_type in self.subscribers:
-            disconnected_queues = []
-            for queue in self.subscribers[event_type]:
+        # Notify subscribers of this type and wildcard subscribers (all events).
+        # The cached tuple is a snapshot; disconnected queues are removed afterwards.
+        targets = self._fanout.get(event.event_type)
+        if targets is None:
+            targets = self._fanout[event.event_type] = (
+                tuple(self.subscribers.get(event.event_type, ())) +
+                tuple(self.subscribers.get("*", ()))
+            )
+        disconnected_queues = []
+        for queue in targets:
+            try:
                 try:
-                    await queue.put(event)
-                except Exception as e:
-                    logger.error(f"Failed to deliver event to subscriber: {e}")
-                    disconnected_queues.append(queue)
-            
-            # Clean up disconnected subscribers
-            for queue in disconnected_queues:
-                self.subscribers[event_type].discard(queue)
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Slow subscriber: drop its oldest event, like the history ring buffer
+                    queue.get_nowait()
+                    queue.put_nowait(event)
+                    self.dropped_counts[queue] += 1
+            except Exception as e:
+                logger.error(f"Failed to deliver event to subscriber: {e}")
+                disconnected_queues.append(queue)
         
-        # Also notify wildcard subscribers (subscribed to all events)
-        if "*" in self.subscribers:
-            for queue in self.subscribers["*"]:
-                try:
-                    await queue.put(event)
-                except Exception as e:
-                    logger.error(f"Failed to deliver event to wildcard subscriber: {e}")
+        # Clean up disconnected subscribers
+        if disconnected_queues:
+            for queue in disconnected_queues:
+                self.dropped_counts.pop(queue, None)
+            for subscribed_type, queues in self.subscribers.items():
+                self.subscribers[subscribed_type] = [
+                    q for q in queues if q not in disconnected_queues
+                ]
+            self._fanout.clear()
     
     async def subscribe(self, event_type: str = "*") -> AsyncIterator[Event]:
         """
         Subscribe to events of a specific type.
         
+        Each subscriber has a queue of up to buffer_size events; if it falls
+        further behind, its oldest undelivered events are dropped.
+        
         Args:
             event_type: Type of events to subscribe to, or "*" for all events
             
         Yields:
             Events as they are published
         """
-        queue: asyncio.Queue = asyncio.Queue()
+        queue = self._add_subscriber(event_type)
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+        finally:
+            self._remove_subscriber(event_type, queue)
+    
+    async def subscribe_batches(
+        self,
+        event_type: str = "*",
+        max_batch: int = 32
+    ) -> AsyncIterator[List[Event]]:
+        """
+        Subscribe to events, receiving whatever has queued up as one batch.
         
-        # Register subscriber
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = set()
-        self.subscribers[event_type].add(queue)
+        Lets a consumer that pays per message (e.g. one WebSocket frame per
+        send) handle a burst of events at once. Queue bounds and drop policy
+        are the same as for subscribe().
         
-        logger.info(f"New subscriber for event type: {event_type}")
+        Args:
+            event_type: Type of events to subscribe to, or "*" for all events
+            max_batch: Maximum number of events per batch
         
+        Yields:
+            Non-empty lists of events, in publish order
+        """
+        queue = self._add_subscriber(event_type)
         try:
             while True:
-                event = await queue.get()
-                yield event
+                batch = [await queue.get()]
+                while len(batch) < max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                yield batch
         finally:
-            # Unsubscribe on cleanup
-            if event_type in self.subscribers:
-                self.subscribers[event_type].discard(queue)
-                logger.info(f"Subscriber unsubscribed from: {event_type}")
+            self._remove_subscriber(event_type, queue)
+    
+    def _add_subscriber(self, event_type: str) -> asyncio.Queue:
+        """Create and register a bounded queue for a subscription"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+        self.subscribers.setdefault(event_type, []).append(queue)
+        self._fanout.clear()
+        self.dropped_counts[queue] = 0
+        
+        logger.info(f"New subscriber for event type: {event_type}")
+        return queue
+    
+    def _remove_subscriber(self, event_type: str, queue: asyncio.Queue) -> None:
+        """Unregister a subscription queue"""
+        self.dropped_counts.pop(queue, None)
+        queues = self.subscribers.get(event_type)
+        if queues is None:
+            return
+        try:
+            queues.remove(queue)
+        except ValueError:
+            return
+        self._fanout.clear()
+        logger.info(f"Subscriber unsubscribed from: {event_type}")
     
     def get_history(self, limit: Optional[int] = None, event_type: Optional[str] = None) -> List[Event]:
         """
@@ -103,25 +181,24 @@ class EventBus:
         Returns:
             List of events in reverse chronological order (newest first)
         """
-        events = list(self.history)
-        
-        # Filter by event type if specified
+        # Walk newest first, materializing only the events returned;
+        # a type filter reads that type's index instead of scanning
         if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        
-        # Reverse to get newest first
-        events.reverse()
+            events_iter = reversed(self._history_by_type.get(event_type, ()))
+        else:
+            events_iter = reversed(self.history)
         
         # Apply limit
-        if limit:
-            events = events[:limit]
+        events = list(islice(events_iter, limit or None))
         
-        logger.debug(f"History query: {len(events)} events returned")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"History query: {len(events)} events returned")
         return events
     
     def clear_history(self) -> None:
         """Clear all events from history."""
         self.history.clear()
+        self._history_by_type.clear()
         logger.info("Event history cleared")
     
     def get_stats(self) -> Dict:
@@ -130,5 +207,9 @@ class EventBus:
             "history_size": len(self.history),
             "buffer_size": self.buffer_size,
             "subscriber_count": sum(len(subs) for subs in self.subscribers.values()),
+            "dropped_events": {
+                event_type: [self.dropped_counts.get(q, 0) for q in subs]
+                for event_type, subs in self.subscribers.items()
+            },
             "event_types": list(self.subscribers.keys())
         }
@@ -0,0 +1,50 @@
+# Batched image loader for captured frames
+from pathlib import Path
+from typing import List, Union
+
+from backend.batched_io import BatchedIO
+
+
+def _read_batch(paths: List[Path]) -> List[Union[bytes, Exception]]:
+    """Read a batch of files in one worker thread, capturing per-file errors"""
+    results: List[Union[bytes, Exception]] = []
+    for path in paths:
+        try:
+            results.append(path.read_bytes())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class ImageLoader(BatchedIO[Path]):
+    """
+    Loads captured images from disk without blocking the event loop.
+    
+    Reads requested within a short debounce window are served by a single
+    worker-thread hop (see BatchedIO).
+    """
+    
+    def __init__(self, max_batch: int = 32, debounce_seconds: float = 0.001):
+        """
+        Initialize image loader.
+        
+        Args:
+            max_batch: Maximum number of reads served by one worker hop
+            debounce_seconds: How long to wait for more reads before flushing
+        """
+        super().__init__(_read_batch, max_batch, debounce_seconds, label="image read")
+    
+    async def read(self, path: Path) -> bytes:
+        """
+        Read a file's bytes.
+        
+        Args:
+            path: File to read
+        
+        Returns:
+            File contents
+        
+        Raises:
+            OSError: If the file cannot be read (e.g. FileNotFoundError)
+        """
+        return await self._submit(path)
@@ -0,0 +1,49 @@
+# Batched image writer for captured frames
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from backend.batched_io import BatchedIO
+
+
+def _write_batch(items: List[Tuple[Path, bytes]]) -> List[Optional[Exception]]:
+    """Write a batch of files in one worker thread, capturing per-file errors"""
+    results: List[Optional[Exception]] = []
+    for path, data in items:
+        try:
+            path.write_bytes(data)
+            results.append(None)
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class ImageWriter(BatchedIO[Tuple[Path, bytes]]):
+    """
+    Writes captured images to disk without blocking the event loop.
+    
+    The write-side counterpart of ImageLoader: writes requested within a
+    short debounce window share one worker-thread hop (see BatchedIO).
+    """
+    
+    def __init__(self, max_batch: int = 32, debounce_seconds: float = 0.001):
+        """
+        Initialize image writer.
+        
+        Args:
+            max_batch: Maximum number of writes served by one worker hop
+            debounce_seconds: How long to wait for more writes before flushing
+        """
+        super().__init__(_write_batch, max_batch, debounce_seconds, label="image write")
+    
+    async def write(self, path: Path, data: bytes) -> None:
+        """
+        Write bytes to a file, replacing any existing content.
+        
+        Args:
+            path: File to write
+            data: File contents
+        
+        Raises:
+            OSError: If the file cannot be written
+        """
+        await self._submit((path, data))
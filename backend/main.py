@@ -1,21 +1,33 @@
 # ESP32 ASR Capture Vision MVP - Backend Entry Point
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Form
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import logging
 import os
 import time
-import json
 import asyncio
+import itertools
+import shutil
+from collections import Counter
+from contextlib import asynccontextmanager
+from email.utils import formatdate
 from pathlib import Path
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple
 
+import httpx
+
+from backend import fast_json
 from backend.models import Event, EventType, ConnectionState, ConnectionType
 from backend.event_bus import EventBus
 from backend.app_coordinator import AppCoordinator
 from backend.config import load_settings, validate_api_keys
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,10 +45,33 @@ except Exception as e:
     logger.error(f"Failed to load settings: {e}")
     raise
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the application with the server"""
+    global heartbeat_task, ui_forward_task
+    logger.info("Starting ESP32 ASR Capture Vision MVP...")
+    
+    # One pooled HTTP client for all outbound calls, closed on shutdown
+    app.state.http = httpx.AsyncClient(limits=httpx.Limits(max_connections=256))
+    await app_coordinator.start(http_client=app.state.http)
+    heartbeat_task = asyncio.create_task(heartbeat_loop())
+    ui_forward_task = asyncio.create_task(forward_events_to_ui())
+    logger.info("Application started successfully")
+    
+    yield
+    
+    logger.info("Shutting down...")
+    heartbeat_task.cancel()
+    ui_forward_task.cancel()
+    await app_coordinator.stop()
+    await app.state.http.aclose()
+    logger.info("Application stopped")
+
 app = FastAPI(
     title="ESP32 ASR Capture Vision MVP",
     description="Backend service for voice-controlled object recognition",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for Web UI
@@ -52,52 +87,59 @@ app.add_middleware(
 IMAGES_DIR = Path("images")
 IMAGES_DIR.mkdir(exist_ok=True)
 
+# Number of stored images: counted once here, then kept current as images
+# are written, so the health check never lists the directory
+images_stored = sum(1 for entry in os.scandir(IMAGES_DIR) if entry.name.endswith(".jpg"))
+
 # Initialize application coordinator
 app_coordinator = AppCoordinator(settings)
 event_bus = app_coordinator.get_event_bus()
 capture_coordinator = app_coordinator.get_capture_coordinator()
+image_writer = app_coordinator.image_writer
+
+# Store connected clients with connection state, and their sockets
+connected_clients: Dict[int, ConnectionState] = {}
+client_sockets: Dict[int, WebSocket] = {}
+# Connection IDs: small ints are cheaper to create and hash than strings
+_next_conn_id = itertools.count(1)
+# Outgoing frames per Web UI client, bounded: a slow client loses its
+# oldest frames instead of growing memory or delaying the others
+UI_QUEUE_SIZE = 256
+web_ui_clients: Dict[int, asyncio.Queue] = {}
+# Open connections per conn_type, kept in step with connected_clients
+connection_counts: Counter = Counter()
 
-# Store connected clients with connection state
-connected_clients: Dict[str, ConnectionState] = {}
+# Background tasks (e.g. image archival writes) kept alive until done
+background_tasks: Set[asyncio.Task] = set()
 
 # Heartbeat configuration
 HEARTBEAT_INTERVAL = 30  # seconds
 HEARTBEAT_TIMEOUT = 60  # seconds
 
+# Pong frames as the clients serialize them; matched without parsing
+_PONG_FRAMES = frozenset({'{"type":"pong"}', '{"type": "pong"}'})
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup"""
-    logger.info("Starting ESP32 ASR Capture Vision MVP...")
-    await app_coordinator.start()
-    logger.info("Application started successfully")
+# Single ping loop shared by all connections, and the single task that
+# fans events out to every Web UI client (both started on startup)
+heartbeat_task: Optional[asyncio.Task] = None
+ui_forward_task: Optional[asyncio.Task] = None
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Shutting down...")
-    await app_coordinator.stop()
-    logger.info("Application stopped")
-
 @app.get("/")
 async def root():
     return {"message": "ESP32 ASR Capture Vision MVP Backend", "status": "running"}
 
 @app.get("/api/health")
 async def health_check():
-    esp32_audio = any(c.conn_type == ConnectionType.ESP32_AUDIO.value for c in connected_clients.values())
-    esp32_camera = any(c.conn_type == ConnectionType.ESP32_CAMERA.value for c in connected_clients.values())
-    web_ui = any(c.conn_type == ConnectionType.WEB_UI.value for c in connected_clients.values())
-    
     return {
         "status": "healthy",
-        "esp32_audio_connected": esp32_audio,
-        "esp32_camera_connected": esp32_camera,
-        "web_ui_connected": web_ui,
+        "esp32_audio_connected": connection_counts[ConnectionType.ESP32_AUDIO.value] > 0,
+        "esp32_camera_connected": connection_counts[ConnectionType.ESP32_CAMERA.value] > 0,
+        "web_ui_connected": connection_counts[ConnectionType.WEB_UI.value] > 0,
         "total_connections": len(connected_clients),
-        "images_stored": len(list(IMAGES_DIR.glob("*.jpg"))),
-        "event_bus_stats": event_bus.get_stats()
+        "images_stored": images_stored,
+        "event_bus_stats": event_bus.get_stats(),
+        "vision_cache_stats": app_coordinator.vision_cache.get_stats()
     }
 
 @app.get("/api/history")
@@ -115,37 +157,39 @@ async def upload_image(
     req_id: str = Form(None)
 ):
     """HTTP endpoint for image upload (for testing)"""
+    global images_stored
     try:
         # Generate filename
-        timestamp = int(time.time() * 1000)
+        received_at = time.time()
+        timestamp = int(received_at * 1000)
         req_id_str = req_id or f"test-{timestamp}"
         filename = f"{req_id_str}_{timestamp}.jpg"
         filepath = IMAGES_DIR / filename
         
-        # Save image
-        content = await file.read()
-        with open(filepath, "wb") as f:
-            f.write(content)
+        # Copy the spooled upload to disk in a worker thread, 64 KiB at a
+        # time, so the image is never held in memory whole
+        size = await asyncio.to_thread(_save_upload, file.file, filepath)
+        images_stored += 1
         
-        logger.info(f"Image saved: {filename} ({len(content)} bytes)")
+        logger.info(f"Image saved: {filename} ({size} bytes)")
         
         # Notify Web UI clients
         event = {
             "event_type": "capture_received",
-            "timestamp": time.time(),
+            "timestamp": received_at,
             "req_id": req_id_str,
             "data": {
                 "filename": filename,
-                "image_size": len(content),
+                "image_size": size,
                 "format": "jpeg"
             }
         }
-        await broadcast_to_web_ui(event)
+        broadcast_to_web_ui(fast_json.dumps(event))
         
         return {
             "success": True,
             "filename": filename,
-            "size": len(content),
+            "size": size,
             "path": str(filepath)
         }
     except Exception as e:
@@ -155,92 +199,122 @@ async def upload_image(
             content={"success": False, "error": str(e)}
         )
 
+def _save_upload(source: BinaryIO, path: Path) -> int:
+    """Copy an uploaded file to path in bounded chunks; returns bytes written"""
+    source.seek(0)
+    with open(path, "wb") as dest:
+        shutil.copyfileobj(source, dest, 1 << 16)
+        return dest.tell()
+
+def _on_image_archived(task: asyncio.Task) -> None:
+    """Count a successfully archived camera image, or log why it failed"""
+    global images_stored
+    background_tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(f"Failed to archive image: {error}")
+    else:
+        images_stored += 1
+
 @app.get("/api/images")
-async def list_images():
+async def list_images(request: Request):
     """List all stored images"""
+    images, etag, last_modified = await asyncio.to_thread(_scan_images)
+    headers = {"ETag": etag, "Last-Modified": formatdate(last_modified, usegmt=True)}
+    
+    # Unchanged directory: skip building and sending the listing
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse({"images": images, "count": len(images)}, headers=headers)
+
+def _scan_images() -> Tuple[List[Dict], str, float]:
+    """
+    List stored images with one directory scan.
+    
+    Returns:
+        (image entries newest filename first, ETag, latest mtime)
+    """
+    with os.scandir(IMAGES_DIR) as it:
+        entries = sorted(
+            (entry for entry in it if entry.name.endswith(".jpg")),
+            key=lambda entry: entry.name,
+            reverse=True
+        )
+    
     images = []
-    for img_path in sorted(IMAGES_DIR.glob("*.jpg"), reverse=True):
-        stat = img_path.stat()
+    latest = 0.0
+    for entry in entries:
+        stat = entry.stat()
+        latest = max(latest, stat.st_mtime)
         images.append({
-            "filename": img_path.name,
+            "filename": entry.name,
             "size": stat.st_size,
             "created": stat.st_mtime
         })
-    return {"images": images, "count": len(images)}
+    
+    # Count is part of the tag so deleting an older image also changes it
+    etag = f'W/"{len(images)}-{int(latest * 1_000_000)}"'
+    return images, etag, latest
 
 @app.websocket("/ws_audio")
 async def websocket_audio(websocket: WebSocket):
     """WebSocket endpoint for ESP32 audio upload"""
     await websocket.accept()
-    client_id = f"esp32_audio_{id(websocket)}"
-    
-    # Create connection state
-    conn_state = ConnectionState(
-        conn_id=client_id,
-        conn_type=ConnectionType.ESP32_AUDIO.value,
-        connected_at=time.time(),
-        last_heartbeat=time.time(),
-        metadata={}
-    )
-    connected_clients[client_id] = conn_state
+    conn_state = _register_client(websocket, ConnectionType.ESP32_AUDIO.value)
+    client_id = conn_state.conn_id
     logger.info(f"ESP32 audio connected: {client_id}")
     
-    # Start heartbeat task
-    heartbeat_task = asyncio.create_task(send_heartbeat(websocket, client_id))
-    
     try:
         while True:
-            # Receive audio data (binary PCM16)
-            data = await websocket.receive()
+            # Receive audio data (binary PCM16); nearly every frame is binary,
+            # so that case is a single lookup and everything else comes after
+            message = await websocket.receive()
+            audio_chunk = message.get("bytes")
             
-            if "bytes" in data:
-                audio_chunk = data["bytes"]
+            if audio_chunk is not None:
                 # Update heartbeat
-                conn_state.last_heartbeat = time.time()
+                conn_state.last_heartbeat = time.monotonic()
                 
                 # TODO: Forward to ASR bridge
                 logger.debug(f"Received audio chunk: {len(audio_chunk)} bytes")
-                
-            elif "text" in data:
-                # Handle control messages
-                message = json.loads(data["text"])
-                if message.get("type") == "pong":
-                    conn_state.last_heartbeat = time.time()
+                continue
+            
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            # Handle control messages
+            text = message.get("text")
+            if text is not None and (text in _PONG_FRAMES or fast_json.loads(text).get("type") == "pong"):
+                conn_state.last_heartbeat = time.monotonic()
                     
     except WebSocketDisconnect:
         logger.info(f"ESP32 audio disconnected: {client_id}")
     except Exception as e:
         logger.error(f"WebSocket audio error: {e}")
     finally:
-        heartbeat_task.cancel()
-        if client_id in connected_clients:
-            del connected_clients[client_id]
+        _unregister_client(client_id)
 
 @app.websocket("/ws_ctrl")
 async def websocket_ctrl(websocket: WebSocket):
     """WebSocket endpoint for ESP32 control commands"""
     await websocket.accept()
-    client_id = f"esp32_ctrl_{id(websocket)}"
-    
-    conn_state = ConnectionState(
-        conn_id=client_id,
-        conn_type=ConnectionType.ESP32_CTRL.value,
-        connected_at=time.time(),
-        last_heartbeat=time.time(),
-        metadata={}
-    )
-    connected_clients[client_id] = conn_state
+    conn_state = _register_client(websocket, ConnectionType.ESP32_CTRL.value)
+    client_id = conn_state.conn_id
     logger.info(f"ESP32 control connected: {client_id}")
     
-    heartbeat_task = asyncio.create_task(send_heartbeat(websocket, client_id))
-    
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            if data in _PONG_FRAMES:
+                conn_state.last_heartbeat = time.monotonic()
+                continue
             
+            message = fast_json.loads(data)
             if message.get("type") == "pong":
-                conn_state.last_heartbeat = time.time()
+                conn_state.last_heartbeat = time.monotonic()
             else:
                 logger.debug(f"Received control message: {message}")
                 
@@ -249,117 +323,104 @@ async def websocket_ctrl(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket control error: {e}")
     finally:
-        heartbeat_task.cancel()
-        if client_id in connected_clients:
-            del connected_clients[client_id]
+        _unregister_client(client_id)
 
 @app.websocket("/ws_camera")
 async def websocket_camera(websocket: WebSocket):
     """WebSocket endpoint for ESP32 camera image upload"""
     await websocket.accept()
-    client_id = f"esp32_camera_{id(websocket)}"
-    
-    conn_state = ConnectionState(
-        conn_id=client_id,
-        conn_type=ConnectionType.ESP32_CAMERA.value,
-        connected_at=time.time(),
-        last_heartbeat=time.time(),
-        metadata={}
-    )
-    connected_clients[client_id] = conn_state
+    conn_state = _register_client(websocket, ConnectionType.ESP32_CAMERA.value)
+    client_id = conn_state.conn_id
     logger.info(f"ESP32 camera connected: {client_id}")
     
-    heartbeat_task = asyncio.create_task(send_heartbeat(websocket, client_id))
-    
     try:
         while True:
             # Expect: JSON header first, then binary data
             try:
                 # Receive JSON header
                 header_data = await websocket.receive_text()
-                header = json.loads(header_data)
+                if header_data in _PONG_FRAMES:
+                    conn_state.last_heartbeat = time.monotonic()
+                    continue
+                header = fast_json.loads(header_data)
                 req_id = header.get("req_id", f"unknown-{int(time.time())}")
                 expected_size = header.get("size", 0)
                 
-                conn_state.last_heartbeat = time.time()
+                conn_state.last_heartbeat = time.monotonic()
                 logger.info(f"Receiving image: req_id={req_id}, size={expected_size}")
                 
                 # Receive binary image data
                 image_data = await websocket.receive_bytes()
                 
-                # Save image
-                timestamp = int(time.time() * 1000)
+                # Archive image in the background; the pipeline uses the bytes directly
+                received_at = time.time()
+                timestamp = int(received_at * 1000)
                 filename = f"{req_id}_{timestamp}.jpg"
                 filepath = IMAGES_DIR / filename
                 
-                with open(filepath, "wb") as f:
-                    f.write(image_data)
+                archive_task = asyncio.create_task(image_writer.write(filepath, image_data))
+                background_tasks.add(archive_task)
+                archive_task.add_done_callback(_on_image_archived)
                 
-                logger.info(f"Image saved: {filename} ({len(image_data)} bytes)")
+                logger.info(f"Image received: {filename} ({len(image_data)} bytes)")
                 
                 # Send acknowledgment to ESP32
-                await websocket.send_json({
+                await websocket.send_text(fast_json.dumps({
                     "status": "success",
                     "req_id": req_id,
                     "filename": filename,
                     "size": len(image_data)
-                })
+                }))
                 
-                # Publish event to event bus
+                # Publish event to event bus; the bytes stay with the coordinator
+                image_ref = app_coordinator.stash_image(req_id, image_data)
                 event = Event(
                     event_type=EventType.CAPTURE_RECEIVED.value,
-                    timestamp=time.time(),
+                    timestamp=received_at,
                     req_id=req_id,
                     data={
                         "filename": filename,
                         "image_size": len(image_data),
-                        "format": "jpeg"
+                        "format": "jpeg",
+                        "image_ref": image_ref
                     }
                 )
                 await event_bus.publish(event)
                 
-            except json.JSONDecodeError:
+            except fast_json.JSONDecodeError:
                 logger.error("Invalid JSON header")
-                await websocket.send_json({"status": "error", "message": "Invalid JSON header"})
+                await websocket.send_text(fast_json.dumps({"status": "error", "message": "Invalid JSON header"}))
             
     except WebSocketDisconnect:
         logger.info(f"ESP32 camera disconnected: {client_id}")
     except Exception as e:
         logger.error(f"WebSocket camera error: {e}")
     finally:
-        heartbeat_task.cancel()
-        if client_id in connected_clients:
-            del connected_clients[client_id]
+        _unregister_client(client_id)
 
 @app.websocket("/ws_ui")
 async def websocket_ui(websocket: WebSocket):
     """WebSocket endpoint for Web UI"""
     await websocket.accept()
-    client_id = f"web_ui_{id(websocket)}"
-    
-    conn_state = ConnectionState(
-        conn_id=client_id,
-        conn_type=ConnectionType.WEB_UI.value,
-        connected_at=time.time(),
-        last_heartbeat=time.time(),
-        metadata={}
-    )
-    connected_clients[client_id] = conn_state
+    conn_state = _register_client(websocket, ConnectionType.WEB_UI.value)
+    client_id = conn_state.conn_id
     logger.info(f"Web UI connected: {client_id}")
     
-    # Start heartbeat task
-    heartbeat_task = asyncio.create_task(send_heartbeat(websocket, client_id))
-    
-    # Start event subscription task
-    event_task = asyncio.create_task(forward_events_to_ui(websocket, client_id))
+    # Start receiving broadcast events
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=UI_QUEUE_SIZE)
+    web_ui_clients[client_id] = outbox
+    send_task = asyncio.create_task(send_to_web_ui(websocket, client_id, outbox))
     
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            if data in _PONG_FRAMES:
+                conn_state.last_heartbeat = time.monotonic()
+                continue
             
+            message = fast_json.loads(data)
             if message.get("type") == "pong":
-                conn_state.last_heartbeat = time.time()
+                conn_state.last_heartbeat = time.monotonic()
             else:
                 logger.debug(f"Received from Web UI: {message}")
                 
@@ -368,51 +429,126 @@ async def websocket_ui(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket UI error: {e}")
     finally:
-        heartbeat_task.cancel()
-        event_task.cancel()
-        if client_id in connected_clients:
-            del connected_clients[client_id]
+        web_ui_clients.pop(client_id, None)
+        send_task.cancel()
+        _unregister_client(client_id)
+
+def _register_client(websocket: WebSocket, conn_type: str) -> ConnectionState:
+    """Assign an ID to an accepted WebSocket and track it for the heartbeat loop"""
+    client_id = next(_next_conn_id)
+    conn_state = ConnectionState(
+        conn_id=client_id,
+        conn_type=conn_type,
+        connected_at=time.time(),
+        last_heartbeat=time.monotonic(),
+        metadata={}
+    )
+    connected_clients[client_id] = conn_state
+    client_sockets[client_id] = websocket
+    connection_counts[conn_type] += 1
+    return conn_state
 
-async def send_heartbeat(websocket: WebSocket, client_id: str):
-    """Send periodic heartbeat pings to keep connection alive"""
+def _unregister_client(client_id: int) -> None:
+    """Stop tracking a closed WebSocket"""
+    conn_state = connected_clients.pop(client_id, None)
+    client_sockets.pop(client_id, None)
+    if conn_state is not None:
+        connection_counts[conn_state.conn_type] -= 1
+
+async def heartbeat_loop():
+    """
+    Ping all connected clients every HEARTBEAT_INTERVAL seconds.
+    
+    One loop serves every connection, so the number of timers does not grow
+    with the client count and a disconnect cancels nothing. Clients whose
+    last pong (or audio chunk) is older than HEARTBEAT_TIMEOUT are closed.
+    """
     try:
         while True:
             await asyncio.sleep(HEARTBEAT_INTERVAL)
             
-            # Check if client is still connected
-            if client_id not in connected_clients:
-                break
-            
-            conn_state = connected_clients[client_id]
-            
-            # Check for timeout
-            if time.time() - conn_state.last_heartbeat > HEARTBEAT_TIMEOUT:
-                logger.warning(f"Client {client_id} heartbeat timeout")
-                await websocket.close()
-                break
-            
-            # Send ping
-            try:
-                await websocket.send_json({"type": "ping", "timestamp": time.time()})
-            except Exception as e:
-                logger.error(f"Failed to send heartbeat to {client_id}: {e}")
-                break
+            now = time.monotonic()
+            ping = fast_json.dumps({"type": "ping", "timestamp": time.time()})
+            sends = {}
+            for client_id, conn_state in list(connected_clients.items()):
+                websocket = client_sockets.get(client_id)
+                if websocket is None:
+                    continue
                 
+                # Check for timeout
+                if now - conn_state.last_heartbeat > HEARTBEAT_TIMEOUT:
+                    logger.warning(f"Client {client_id} ({conn_state.conn_type}) heartbeat timeout")
+                    sends[client_id] = websocket.close()
+                else:
+                    sends[client_id] = websocket.send_text(ping)
+            
+            results = await asyncio.gather(*sends.values(), return_exceptions=True)
+            for client_id, result in zip(sends, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to send heartbeat to {client_id}: {result}")
+    
     except asyncio.CancelledError:
         pass
 
-async def forward_events_to_ui(websocket: WebSocket, client_id: str):
-    """Forward all events from event bus to Web UI client"""
+def broadcast_to_web_ui(payload: str) -> None:
+    """Queue one pre-serialized frame for every connected Web UI client"""
+    for client_id, outbox in web_ui_clients.items():
+        try:
+            outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Drop the oldest frame so the client catches up on recent events
+            outbox.get_nowait()
+            outbox.put_nowait(payload)
+            logger.warning(f"Web UI client {client_id} is lagging; dropped oldest event")
+
+async def send_to_web_ui(websocket: WebSocket, client_id: int, outbox: asyncio.Queue):
+    """Drain one Web UI client's outbox to its socket"""
     try:
-        async for event in event_bus.subscribe("*"):
-            if client_id not in connected_clients:
-                break
+        while True:
+            payload = await outbox.get()
+            await websocket.send_text(payload)
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f"Failed to forward event to {client_id}: {e}")
+        web_ui_clients.pop(client_id, None)
+
+async def forward_events_to_ui():
+    """
+    Forward all events from the event bus to the Web UI clients.
+    
+    A single subscription serves every client: each batch is serialized
+    once and the same frame is queued for all of them.
+    """
+    try:
+        # Events that queued up before this task ran go out together as one
+        # JSON array frame; a lone event is sent as an object
+        async for batch in event_bus.subscribe_batches("*"):
+            if not web_ui_clients:
+                continue
+            
+            # Serialize events one by one so a bad event is skipped, not
+            # the rest of its batch
+            frames = []
+            for event in batch:
+                try:
+                    frames.append(event.to_json())
+                except Exception as e:
+                    logger.error(f"Failed to serialize {event.event_type} event for Web UI: {e}")
+            if not frames:
+                continue
             
+            # Every client depends on this one task: a failure loses the
+            # batch, never the forwarder
             try:
-                await websocket.send_json(event.to_dict())
+                if len(frames) == 1:
+                    payload = frames[0]
+                else:
+                    payload = "[" + ",".join(frames) + "]"
+                
+                broadcast_to_web_ui(payload)
             except Exception as e:
-                logger.error(f"Failed to forward event to {client_id}: {e}")
-                break
+                logger.error(f"Failed to forward events to Web UI: {e}")
                 
     except asyncio.CancelledError:
         pass
@@ -423,4 +559,15 @@ if Path("../web").exists():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Run the event loop on libuv when available (lower per-await overhead).
+    # The websockets protocol negotiates permessage-deflate per connection;
+    # its compression context persists across frames, so the repetitive
+    # event JSON sent to the Web UI compresses well after the first message
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if uvloop else "asyncio",
+        ws="websockets",
+        ws_per_message_deflate=True
+    )
@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 from enum import Enum
 
+from backend import fast_json
+
 
 class EventType(str, Enum):
     """Event types for the system"""
@@ -73,25 +75,41 @@ class ErrorType(str, Enum):
     INTERNAL_ERROR = "internal_error"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Event:
-    """Event data structure"""
+    """Event data structure (immutable once built; shared by all subscribers)"""
     event_type: str
     timestamp: float
     req_id: Optional[str] = None
     data: Dict[str, Any] = field(default_factory=dict)
+    # Serialized form, computed once and shared by every subscriber
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_json(self) -> str:
+        """
+        Serialize to a JSON string for WebSocket text frames.
+        
+        Cached on first call; events must not be mutated after publishing.
+        """
+        if self._json is None:
+            # The cache is the one field filled in after construction
+            object.__setattr__(self, "_json", fast_json.dumps(self.to_dict()))
+        return self._json
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
+        """Convert to dictionary for JSON serialization (binary payloads and streams are omitted)"""
         return {
             "event_type": self.event_type,
             "timestamp": self.timestamp,
             "req_id": self.req_id,
-            "data": self.data
+            "data": {
+                k: v for k, v in self.data.items()
+                if not isinstance(v, (bytes, bytearray, memoryview)) and not hasattr(v, "__aiter__")
+            }
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestContext:
     """Context for a single trigger->capture->vision request"""
     req_id: str
@@ -104,17 +122,17 @@ class RequestContext:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionState:
     """WebSocket connection state tracking"""
-    conn_id: str
-    conn_type: str
+    conn_id: int
+    conn_type: str  # ConnectionType value, also used to label logs
     connected_at: float
-    last_heartbeat: float
+    last_heartbeat: float  # time.monotonic() of the last pong or data frame
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class VisionResult:
     """Result from vision model analysis"""
     text: str
@@ -1,27 +1,29 @@
 # Question Trigger Engine for ESP32 Real-Time AI Assistant
 import asyncio
+import re
 import time
 import logging
-from typing import Optional, List, Dict
+from typing import Optional, Dict, Sequence
 from dataclasses import dataclass
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 
 from backend.event_bus import EventBus
 from backend.models import Event, EventType
+from backend.cooldown import CooldownMixin
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggerConfig:
     """Configuration for trigger detection"""
-    english_triggers: List[str]
-    chinese_triggers: List[str]
+    english_triggers: Sequence[str]
+    chinese_triggers: Sequence[str]
     cooldown_seconds: float = 3.0
     fuzzy_match_threshold: float = 0.85
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggerMatch:
     """Result of trigger phrase matching"""
     phrase: str
@@ -30,7 +32,7 @@ class TriggerMatch:
     question: str
 
 
-class QuestionTriggerEngine:
+class QuestionTriggerEngine(CooldownMixin):
     """
     Detects question phrases in ASR transcriptions and triggers image capture.
     
@@ -52,16 +54,30 @@ class QuestionTriggerEngine:
         """
         self.event_bus = event_bus
         self.config = config
-        self.last_trigger_time: Optional[float] = None
+        self._init_cooldown(config.cooldown_seconds)
         self.active_request_id: Optional[str] = None
         self._running = False
         self._task: Optional[asyncio.Task] = None
         
         # Combine all trigger phrases
         self.all_triggers = (
-            self.config.english_triggers + 
-            self.config.chinese_triggers
+            tuple(self.config.english_triggers) +
+            tuple(self.config.chinese_triggers)
         )
+        # (phrase, lowercased phrase) pairs, so matching never re-lowers phrases
+        self._lowered_triggers = tuple(
+            (phrase, phrase.lower()) for phrase in self.all_triggers
+        )
+        self._phrases_lower = tuple(phrase_lower for _, phrase_lower in self._lowered_triggers)
+        # All exact matches in one scan; longest phrases first so a phrase
+        # wins over any shorter phrase that is its prefix
+        self._phrase_by_lower: Dict[str, str] = {}
+        for phrase, phrase_lower in self._lowered_triggers:
+            self._phrase_by_lower.setdefault(phrase_lower, phrase)
+        self._exact_pattern: Optional[re.Pattern] = None
+        if self._phrase_by_lower:
+            longest_first = sorted(self._phrase_by_lower, key=len, reverse=True)
+            self._exact_pattern = re.compile("|".join(map(re.escape, longest_first)))
         
         logger.info(
             f"QuestionTriggerEngine initialized with {len(self.all_triggers)} trigger phrases"
@@ -108,18 +124,20 @@ class QuestionTriggerEngine:
         Args:
             event: ASR transcription event
         """
+        # Check cooldown first: it is the cheapest test and skips all text work
+        if self._is_cooldown_active():
+            logger.debug("Cooldown active, ignoring transcription")
+            return
+        
         text = event.data.get("text", "")
         if not text:
             return
         
         logger.debug(f"Processing transcription: {text}")
         
-        # Check cooldown
-        if self._is_cooldown_active():
-            logger.debug("Cooldown active, ignoring transcription")
-            return
-        
-        # Detect trigger phrase
+        # Detect trigger phrase inline: the regex scan and extractOne both hold
+        # the GIL, so a worker thread adds a hand-off without running in
+        # parallel, and matching takes tens of microseconds
         trigger_match = self._detect_trigger(text)
         if trigger_match:
             logger.info(
@@ -138,6 +156,9 @@ class QuestionTriggerEngine:
         """
         Detect trigger phrases in text using exact and fuzzy matching.
         
+        Exact matches for every phrase are found in one precompiled scan;
+        only if none is present are phrases fuzzy-matched one by one.
+        
         Args:
             text: Transcribed text to search
             
@@ -146,32 +167,35 @@ class QuestionTriggerEngine:
         """
         text_lower = text.lower()
         
-        for phrase in self.all_triggers:
-            phrase_lower = phrase.lower()
-            
-            # Exact match
-            if phrase_lower in text_lower:
-                position = text_lower.index(phrase_lower)
+        # Exact match
+        if self._exact_pattern is not None:
+            found = self._exact_pattern.search(text_lower)
+            if found:
                 return TriggerMatch(
-                    phrase=phrase,
+                    phrase=self._phrase_by_lower[found.group()],
                     confidence=1.0,
-                    position=position,
-                    question=text
-                )
-            
-            # Fuzzy match
-            ratio = fuzz.partial_ratio(phrase_lower, text_lower)
-            confidence = ratio / 100.0
-            
-            if confidence >= self.config.fuzzy_match_threshold:
-                return TriggerMatch(
-                    phrase=phrase,
-                    confidence=confidence,
-                    position=0,
+                    position=found.start(),
                     question=text
                 )
         
-        return None
+        # Fuzzy match: best-scoring phrase in one call, with phrases below
+        # the cutoff pruned before their alignment finishes
+        best = process.extractOne(
+            text_lower,
+            self._phrases_lower,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=self.config.fuzzy_match_threshold * 100
+        )
+        if best is None:
+            return None
+        
+        _, score, index = best
+        return TriggerMatch(
+            phrase=self._lowered_triggers[index][0],
+            confidence=score / 100.0,
+            position=0,
+            question=text
+        )
     
     def _is_cooldown_active(self) -> bool:
         """
@@ -180,11 +204,7 @@ class QuestionTriggerEngine:
         Returns:
             True if cooldown is active, False otherwise
         """
-        if self.last_trigger_time is None:
-            return False
-        
-        elapsed = time.time() - self.last_trigger_time
-        return elapsed < self.config.cooldown_seconds
+        return self._cooldown_active()
     
     async def _emit_capture_trigger(
         self, 
@@ -200,19 +220,22 @@ class QuestionTriggerEngine:
             device_id: Device ID
             req_id: Request ID (optional)
         """
+        # One clock read stamps the cooldown, request ID and event alike
+        now = time.time()
+        
         # Update cooldown timer
-        self.last_trigger_time = time.time()
+        self._start_cooldown(now)
         
         # Generate request ID if not provided
         if not req_id:
-            req_id = f"tts_{int(time.time() * 1000)}"
+            req_id = f"tts_{int(now * 1000)}"
         
         self.active_request_id = req_id
         
         # Create and publish event
         event = Event(
             event_type=EventType.QUESTION_DETECTED.value,
-            timestamp=time.time(),
+            timestamp=now,
             req_id=req_id,
             data={
                 "question": question,
@@ -1,37 +1,51 @@
 # Trigger Engine for keyword detection
-import time
+import re
 import uuid
 import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Sequence
 from backend.models import Event, EventType, RequestContext, RequestState
 from backend.event_bus import EventBus
+from backend.cooldown import CooldownMixin
 
 logger = logging.getLogger(__name__)
 
+# Trigger keywords (case-insensitive)
+DEFAULT_TRIGGER_KEYWORDS = (
+    "識別物品",
+    "認下呢個係咩",
+    "幫我認",
+    "睇下呢個",
+    "辨識物品",
+    "這是什麼",
+    "这是什么"
+)
 
-class TriggerEngine:
+
+class TriggerEngine(CooldownMixin):
     """
     Detects trigger keywords in ASR text and generates CAPTURE requests.
     Implements cooldown mechanism to prevent duplicate triggers.
     """
     
-    def __init__(self, event_bus: EventBus, cooldown_seconds: int = 3):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        cooldown_seconds: int = 3,
+        trigger_keywords: Sequence[str] = DEFAULT_TRIGGER_KEYWORDS
+    ):
         self.event_bus = event_bus
         self.cooldown_seconds = cooldown_seconds
-        self.last_trigger_time: Optional[float] = None
+        self._init_cooldown(cooldown_seconds)
         self.active_request: Optional[RequestContext] = None
         
-        # Trigger keywords (case-insensitive)
-        self.trigger_keywords = [
-            "識別物品",
-            "認下呢個係咩",
-            "幫我認",
-            "睇下呢個",
-            "辨識物品",
-            "這是什麼",
-            "这是什么"
-        ]
+        self.trigger_keywords = tuple(trigger_keywords)
+        # Lowercased keyword -> original, and one alternation matching any of
+        # them, so each ASR text is scanned in a single pass. Longest keywords
+        # first, so a keyword wins over any shorter keyword it contains.
+        self._keyword_by_lower = {k.lower(): k for k in self.trigger_keywords}
+        longest_first = sorted(self._keyword_by_lower, key=len, reverse=True)
+        self._keyword_re = re.compile("|".join(map(re.escape, longest_first)))
         
         logger.info(f"TriggerEngine initialized with {len(self.trigger_keywords)} keywords")
     
@@ -45,9 +59,6 @@ class TriggerEngine:
         Returns:
             Trigger event if triggered, None otherwise
         """
-        # Normalize text
-        text_lower = text.lower().strip()
-        
         # Check cooldown
         if self.is_in_cooldown():
             logger.debug(f"In cooldown, ignoring text: {text}")
@@ -58,19 +69,18 @@ class TriggerEngine:
             logger.debug(f"Active request in progress, ignoring text: {text}")
             return None
         
-        # Check for trigger keywords
-        matched_keyword = None
-        for keyword in self.trigger_keywords:
-            if keyword.lower() in text_lower:
-                matched_keyword = keyword
-                break
+        # Normalize text only once the cheap state checks have passed
+        text_lower = text.lower()
         
-        if not matched_keyword:
+        # Check for trigger keywords
+        match = self._keyword_re.search(text_lower)
+        if match is None:
             return None
+        matched_keyword = self._keyword_by_lower[match.group()]
         
-        # Generate trigger event
+        # Generate trigger event; one clock read stamps the request and event
         req_id = str(uuid.uuid4())
-        self.last_trigger_time = time.time()
+        self._start_cooldown()
         
         # Create request context
         self.active_request = RequestContext(
@@ -97,11 +107,7 @@ class TriggerEngine:
     
     def is_in_cooldown(self) -> bool:
         """Check if trigger is in cooldown period"""
-        if self.last_trigger_time is None:
-            return False
-        
-        elapsed = time.time() - self.last_trigger_time
-        return elapsed < self.cooldown_seconds
+        return self._cooldown_active()
     
     def reset_cooldown(self) -> None:
         """Reset cooldown timer"""
@@ -125,4 +131,4 @@ class TriggerEngine:
             logger.info(f"Request {req_id} completed")
             
             # Start cooldown
-            self.last_trigger_time = time.time()
+            self._start_cooldown()
@@ -1,7 +1,10 @@
 # TTS Adapter for ESP32 Real-Time AI Assistant
 import asyncio
 import logging
-from typing import Optional, Dict
+import random
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Optional, Dict, List
 from dataclasses import dataclass
 
 from backend.event_bus import EventBus
@@ -10,8 +13,11 @@ from backend.tts_client import TTSClient, TTSConfig, TTSError
 
 logger = logging.getLogger(__name__)
 
+# Vision responses waiting for a TTS worker; the listener blocks when full
+WORK_QUEUE_SIZE = 16
 
-@dataclass
+
+@dataclass(slots=True)
 class AudioData:
     """Audio data with metadata"""
     audio_bytes: bytes
@@ -28,7 +34,7 @@ class TTSAdapter:
     - Subscribe to vision response events
     - Convert text to speech using TTS service
     - Implement retry logic for TTS failures
-    - Emit audio-ready events with audio data
+    - Emit audio-ready events with audio data, or an audio stream while synthesizing
     - Handle error scenarios with fallback messages
     """
     
@@ -46,6 +52,12 @@ class TTSAdapter:
         self.config = config
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._work_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        
+        # Event timestamps come from the loop clock shifted to wall time
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wall_offset = 0.0
         
         logger.info("TTSAdapter initialized")
     
@@ -56,18 +68,36 @@ class TTSAdapter:
             return
         
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._wall_offset = time.time() - self._loop.time()
+        
+        # Conversions run on worker tasks so a slow TTS call does not hold
+        # up the subscriber. Workers share tts_client; see TTSConfig.concurrency
+        self._work_queue = asyncio.Queue(maxsize=WORK_QUEUE_SIZE)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(max(1, self.config.concurrency))
+        ]
         self._task = asyncio.create_task(self._listen_for_vision_responses())
-        logger.info("TTSAdapter started")
+        # Let the listener subscribe, so events published after start() are seen
+        await asyncio.sleep(0)
+        logger.info(f"TTSAdapter started with {len(self._workers)} worker(s)")
     
     async def stop(self):
         """Stop the TTS adapter"""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        tasks = [self._task, *self._workers] if self._task else list(self._workers)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._workers = []
+        
+        # Drop conversions that never started
+        if self._work_queue is not None:
+            while not self._work_queue.empty():
+                self._work_queue.get_nowait()
         logger.info("TTSAdapter stopped")
     
     async def _listen_for_vision_responses(self):
@@ -77,12 +107,23 @@ class TTSAdapter:
                 if not self._running:
                     break
                 
-                await self._on_vision_response(event)
+                await self._work_queue.put(event)
         except asyncio.CancelledError:
             logger.info("Vision response listener cancelled")
         except Exception as e:
             logger.error(f"Error in vision response listener: {e}")
     
+    async def _worker(self):
+        """Convert queued vision responses to speech, one at a time"""
+        while True:
+            event = await self._work_queue.get()
+            try:
+                await self._on_vision_response(event)
+            except Exception as e:
+                logger.error(f"Error in TTS worker: {e}")
+            finally:
+                self._work_queue.task_done()
+    
     async def _on_vision_response(self, event: Event):
         """
         Handle vision response and convert to speech.
@@ -97,6 +138,16 @@ class TTSAdapter:
         
         logger.info(f"Converting vision response to speech: req_id={event.req_id}")
         
+        if self.config.stream_audio:
+            # Playback pulls the audio while it is synthesized; failures are
+            # reported from inside the stream
+            await self._emit_audio_stream(
+                audio_stream=self._stream_speech_with_retry(text, event.req_id),
+                request_id=event.req_id,
+                device_id=event.data.get("device_id", "unknown")
+            )
+            return
+        
         try:
             # Convert text to speech with retry
             audio_data = await self._convert_to_speech_with_retry(text)
@@ -127,9 +178,12 @@ class TTSAdapter:
         """
         last_error = None
         
-        for attempt in range(self.config.timeout_seconds + 1):
+        for attempt in range(self.config.max_retries + 1):
             try:
                 logger.debug(f"TTS conversion attempt {attempt + 1}")
+                # The client bounds each attempt by timeout_seconds, counted
+                # from when it sends the request (not while queued for its
+                # connection behind another worker)
                 audio_bytes = await self._convert_to_speech(text)
                 
                 # Calculate duration (PCM16 at sample_rate)
@@ -147,14 +201,61 @@ class TTSAdapter:
                 last_error = e
                 logger.warning(f"TTS attempt {attempt + 1} failed: {e}")
                 
-                if attempt < self.config.timeout_seconds:
-                    await asyncio.sleep(0.5)  # Wait before retry
-                else:
-                    break
+                if attempt < self.config.max_retries:
+                    # Exponential backoff with jitter before the next attempt
+                    delay = self.config.backoff_base * 2 ** attempt
+                    await asyncio.sleep(delay + random.uniform(0, 0.05))
         
         # All retries failed
         raise TTSError(f"TTS conversion failed after retries: {last_error}")
     
+    async def _stream_speech_with_retry(self, text: str, request_id: str) -> AsyncIterator[bytes]:
+        """
+        Stream speech audio as the TTS service produces it.
+        
+        Attempts are retried as in _convert_to_speech_with_retry until the
+        first chunk arrives. After that a failure ends the stream, since
+        audio already sent for playback cannot be taken back.
+        
+        Args:
+            text: Text to convert
+            request_id: Request ID for the TTS error event
+        
+        Yields:
+            Audio chunks in configured format
+        
+        Raises:
+            TTSError: If conversion fails (a TTS error event is emitted first)
+        """
+        last_error = None
+        
+        for attempt in range(self.config.max_retries + 1):
+            started = False
+            try:
+                logger.debug(f"TTS stream attempt {attempt + 1}")
+                # Closed explicitly so an abandoned stream frees the connection
+                async with aclosing(self.tts_client.stream_speech(text)) as stream:
+                    async for chunk in stream:
+                        started = True
+                        yield chunk
+                if started:
+                    return
+                last_error = TTSError("No audio data received from TTS service")
+            except TTSError as e:
+                last_error = e
+                if started:
+                    break
+            
+            logger.warning(f"TTS stream attempt {attempt + 1} failed: {last_error}")
+            if attempt < self.config.max_retries:
+                # Exponential backoff with jitter before the next attempt
+                delay = self.config.backoff_base * 2 ** attempt
+                await asyncio.sleep(delay + random.uniform(0, 0.05))
+        
+        error = TTSError(f"TTS streaming failed: {last_error}")
+        await self._emit_error(error, request_id)
+        raise error
+    
     async def _convert_to_speech(self, text: str) -> bytes:
         """
         Convert text to speech audio.
@@ -193,7 +294,7 @@ class TTSAdapter:
         """
         event = Event(
             event_type=EventType.AUDIO_READY.value,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=self._now(),
             req_id=request_id,
             data={
                 "audio_data": audio_data.audio_bytes,
@@ -210,6 +311,35 @@ class TTSAdapter:
             f"duration={audio_data.duration_seconds:.2f}s"
         )
     
+    async def _emit_audio_stream(
+        self,
+        audio_stream: AsyncIterator[bytes],
+        request_id: str,
+        device_id: str
+    ):
+        """
+        Emit audio ready event for audio that is still being synthesized.
+        
+        Args:
+            audio_stream: Audio chunks, consumed by the playback coordinator
+            request_id: Request ID
+            device_id: Device ID
+        """
+        event = Event(
+            event_type=EventType.AUDIO_READY.value,
+            timestamp=self._now(),
+            req_id=request_id,
+            data={
+                "audio_stream": audio_stream,
+                "audio_format": self.config.audio_format,
+                "sample_rate": self.config.sample_rate,
+                "device_id": device_id
+            }
+        )
+        
+        await self.event_bus.publish(event)
+        logger.info(f"Audio stream event emitted: req_id={request_id}")
+    
     async def _emit_error(self, error: Exception, request_id: str):
         """
         Emit TTS error event.
@@ -220,7 +350,7 @@ class TTSAdapter:
         """
         event = Event(
             event_type=EventType.TTS_ERROR.value,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=self._now(),
             req_id=request_id,
             data={
                 "error": str(error),
@@ -231,10 +361,19 @@ class TTSAdapter:
         await self.event_bus.publish(event)
         logger.error(f"TTS error event emitted: req_id={request_id}, error={error}")
     
+    def _now(self) -> float:
+        """Wall-clock event timestamp read from the (cheaper) loop clock"""
+        if self._loop is None:
+            return time.time()
+        return self._loop.time() + self._wall_offset
+    
     def get_stats(self) -> Dict:
         """Get statistics about the TTS adapter"""
         return {
             "running": self._running,
+            "workers": len(self._workers),
+            "stream_audio": self.config.stream_audio,
+            "queued": self._work_queue.qsize() if self._work_queue else 0,
             "config": {
                 "voice": self.config.voice,
                 "language": self.config.language,
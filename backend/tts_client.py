@@ -1,13 +1,18 @@
 # TTS Client for Qwen TTS Service
 import asyncio
 import websockets
-import json
 import logging
 from typing import Optional, AsyncIterator
 from dataclasses import dataclass
 
+from backend import fast_json
+
 logger = logging.getLogger(__name__)
 
+# Placeholders split out of the serialized request template
+_TASK_ID_SLOT = "__task_id__"
+_TEXT_SLOT = "__text__"
+
 
 @dataclass
 class TTSConfig:
@@ -20,7 +25,16 @@ class TTSConfig:
     pitch: float = 1.0
     audio_format: str = "pcm"
     sample_rate: int = 16000
-    timeout_seconds: float = 5.0
+    timeout_seconds: float = 5.0  # per request, from when it is sent
+    max_retries: int = 1
+    backoff_base: float = 0.2  # seconds before the first retry, doubled after each
+    # Publish AUDIO_READY with an audio_stream as soon as synthesis starts,
+    # instead of the complete audio_data once it ends
+    stream_audio: bool = False
+    # TTSAdapter worker tasks. All workers share the adapter's one client, and
+    # TTSClient runs one task at a time on its connection, so more than one
+    # only helps with a client that can serve requests in parallel
+    concurrency: int = 1
 
 
 class TTSError(Exception):
@@ -34,6 +48,55 @@ class TTSClient:
     def __init__(self, config: TTSConfig):
         self.config = config
         self.ws = None
+        # One task at a time on the shared connection
+        self._lock = asyncio.Lock()
+        self._frame_head, self._frame_mid, self._frame_tail = self._build_request_template()
+    
+    def _build_request_template(self):
+        """
+        Serialize the run-task request once, split around its dynamic fields.
+        
+        Only the task ID and input text change between requests, so a
+        request frame is the cached pieces joined with those two values.
+        """
+        request = {
+            "header": {
+                "action": "run-task",
+                "streaming": "duplex",
+                "task_id": _TASK_ID_SLOT
+            },
+            "payload": {
+                "model": "cosyvoice-v1",
+                "task_group": "audio",
+                "task": "tts",
+                "function": "SpeechSynthesizer",
+                "parameters": {
+                    "voice": self.config.voice,
+                    "format": self.config.audio_format,
+                    "sample_rate": self.config.sample_rate,
+                    "volume": 50,
+                    "speech_rate": int(self.config.speed * 100),
+                    "pitch_rate": int(self.config.pitch * 100)
+                },
+                "input": {
+                    "text": _TEXT_SLOT
+                }
+            }
+        }
+        frame = fast_json.dumps(request)
+        head, rest = frame.split(fast_json.dumps(_TASK_ID_SLOT))
+        mid, tail = rest.split(fast_json.dumps(_TEXT_SLOT))
+        return head, mid, tail
+    
+    def _request_frame(self, task_id: str, text: str) -> str:
+        """Run-task request for one text, from the cached template"""
+        return "".join((
+            self._frame_head,
+            fast_json.dumps(task_id),
+            self._frame_mid,
+            fast_json.dumps(text),
+            self._frame_tail
+        ))
     
     async def connect(self):
         """Connect to TTS service"""
@@ -72,80 +135,94 @@ class TTSClient:
         Raises:
             TTSError: If conversion fails
         """
-        if not self.ws:
-            await self.connect()
+        # Keep the received chunks and join them once at the end: a single
+        # allocation and a single copy of the audio
+        chunks = []
+        async for chunk in self.stream_speech(text):
+            chunks.append(chunk)
         
-        try:
-            # Send TTS request
-            request = {
-                "header": {
-                    "action": "run-task",
-                    "streaming": "duplex",
-                    "task_id": f"tts_{asyncio.get_event_loop().time()}"
-                },
-                "payload": {
-                    "model": "cosyvoice-v1",
-                    "task_group": "audio",
-                    "task": "tts",
-                    "function": "SpeechSynthesizer",
-                    "parameters": {
-                        "voice": self.config.voice,
-                        "format": self.config.audio_format,
-                        "sample_rate": self.config.sample_rate,
-                        "volume": 50,
-                        "speech_rate": int(self.config.speed * 100),
-                        "pitch_rate": int(self.config.pitch * 100)
-                    },
-                    "input": {
-                        "text": text
-                    }
-                }
-            }
-            
-            await self.ws.send(json.dumps(request))
-            logger.debug(f"Sent TTS request for text: {text[:50]}...")
-            
-            # Collect audio chunks
-            audio_chunks = []
-            timeout = self.config.timeout_seconds
+        audio_data = b"".join(chunks)
+        if not audio_data:
+            raise TTSError("No audio data received from TTS service")
+        
+        logger.info(f"TTS conversion successful: {len(audio_data)} bytes")
+        
+        return audio_data
+    
+    async def stream_speech(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Convert text to speech, yielding audio as the service produces it.
+        
+        Suitable as an AUDIO_READY "audio_stream" so playback can start
+        before synthesis finishes.
+        
+        Args:
+            text: Text to convert to speech
+        
+        Yields:
+            PCM16 audio chunks
+        
+        Raises:
+            TTSError: If conversion fails
+        """
+        loop = asyncio.get_running_loop()
+        # Requests share one connection, so only one task may use it at a time
+        async with self._lock:
+            # Keep one connection across requests; reconnect only once it has closed
+            if self.ws is None or self.ws.closed:
+                await self.connect()
             
+            finished = False
             try:
-                async with asyncio.timeout(timeout):
-                    async for message in self.ws:
-                        if isinstance(message, bytes):
-                            # Binary audio data
-                            audio_chunks.append(message)
-                        else:
-                            # JSON response
-                            response = json.loads(message)
-                            
-                            # Check for errors
-                            if response.get("header", {}).get("status") == "error":
-                                error_msg = response.get("header", {}).get("message", "Unknown error")
-                                raise TTSError(f"TTS service error: {error_msg}")
-                            
-                            # Check if complete
-                            if response.get("header", {}).get("event") == "task-finished":
-                                logger.debug("TTS conversion complete")
-                                break
-            
-            except asyncio.TimeoutError:
-                raise TTSError(f"TTS conversion timeout after {timeout} seconds")
-            
-            if not audio_chunks:
-                raise TTSError("No audio data received from TTS service")
+                # Send TTS request
+                await self.ws.send(self._request_frame(f"tts_{loop.time()}", text))
+                logger.debug(f"Sent TTS request for text: {text[:50]}...")
+                
+                # Yield audio chunks as they arrive. The deadline is enforced per
+                # receive: a timeout scope around a yield would cancel the consumer.
+                timeout = self.config.timeout_seconds
+                deadline = loop.time() + timeout
+                
+                while True:
+                    try:
+                        message = await asyncio.wait_for(
+                            self.ws.recv(),
+                            timeout=max(deadline - loop.time(), 0)
+                        )
+                    except asyncio.TimeoutError:
+                        raise TTSError(f"TTS conversion timeout after {timeout} seconds")
+                    except websockets.exceptions.ConnectionClosedOK:
+                        break
+                    
+                    if isinstance(message, bytes):
+                        # Binary audio data; time the consumer holds us is not TTS time
+                        paused_at = loop.time()
+                        yield message
+                        deadline += loop.time() - paused_at
+                    else:
+                        # JSON response
+                        response = fast_json.loads(message)
+                        
+                        # Check for errors
+                        if response.get("header", {}).get("status") == "error":
+                            error_msg = response.get("header", {}).get("message", "Unknown error")
+                            raise TTSError(f"TTS service error: {error_msg}")
+                        
+                        # Check if complete
+                        if response.get("header", {}).get("event") == "task-finished":
+                            logger.debug("TTS conversion complete")
+                            finished = True
+                            break
             
-            # Combine audio chunks
-            audio_data = b"".join(audio_chunks)
-            logger.info(f"TTS conversion successful: {len(audio_data)} bytes")
-            
-            return audio_data
-            
-        except TTSError:
-            raise
-        except Exception as e:
-            logger.error(f"TTS conversion failed: {e}")
-            raise TTSError(f"Conversion failed: {e}")
+            except TTSError:
+                raise
+            except Exception as e:
+                logger.error(f"TTS conversion failed: {e}")
+                raise TTSError(f"Conversion failed: {e}")
+            finally:
+                # An unfinished task leaves stale frames on the socket; start fresh next time
+                if not finished:
+                    await self.disconnect()
     
     async def __aenter__(self):
         await self.connect()
@@ -183,6 +260,13 @@ class MockTTSClient:
         logger.info(f"MockTTSClient: Generated {len(audio_data)} bytes of mock audio")
         return audio_data
     
+    async def stream_speech(self, text: str) -> AsyncIterator[bytes]:
+        """Generate mock audio data in 100 ms pieces"""
+        audio_data = await self.convert_to_speech(text)
+        piece = self.config.sample_rate // 10 * 2
+        for start in range(0, len(audio_data), piece):
+            yield audio_data[start:start + piece]
+    
     async def __aenter__(self):
         await self.connect()
         return self
@@ -33,6 +33,27 @@ class VisionLLMAdapter(ABC):
             VisionResult with text response
         """
         pass
+    
+    async def prewarm(self) -> None:
+        """
+        Prepare the connection to the vision service ahead of a request.
+        
+        Called while the capture is still in flight so connection setup
+        overlaps the image wait. Must not raise.
+        """
+        pass
+    
+    def use_http_client(self, client: httpx.AsyncClient) -> None:
+        """
+        Send requests through a shared, application-owned HTTP client.
+        
+        The caller keeps ownership: close() will not close this client.
+        """
+        pass
+    
+    async def close(self) -> None:
+        """Release any connections held by the adapter"""
+        pass
 
 
 class QwenOmniAdapter(VisionLLMAdapter):
@@ -51,9 +72,38 @@ class QwenOmniAdapter(VisionLLMAdapter):
         self.timeout_seconds = timeout_seconds
         self.max_retries = 1
         self.retry_delay = 5
+        # Persistent client so TLS connections are pooled across requests
+        self._client: Optional[httpx.AsyncClient] = None
+        self._owns_client = True
         
         logger.info(f"QwenOmniAdapter initialized with model: {model}")
     
+    def use_http_client(self, client: httpx.AsyncClient) -> None:
+        """Send requests through a shared, application-owned HTTP client"""
+        self._client = client
+        self._owns_client = False
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, creating our own on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds)
+            self._owns_client = True
+        return self._client
+    
+    async def prewarm(self) -> None:
+        """Open a pooled connection (DNS + TCP + TLS) to the vision endpoint"""
+        try:
+            await self._get_client().head(self.endpoint, timeout=self.timeout_seconds)
+            logger.debug("Vision connection prewarmed")
+        except Exception as e:
+            logger.debug(f"Vision prewarm failed: {e}")
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP client (a shared client is left open)"""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+    
     async def analyze_image(
         self,
         image_bytes: bytes,
@@ -98,55 +148,56 @@ class QwenOmniAdapter(VisionLLMAdapter):
             try:
                 logger.info(f"Calling vision API (attempt {attempt + 1}/{self.max_retries + 1})")
                 
-                async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                    response = await client.post(
-                        self.endpoint,
-                        headers=headers,
-                        json=payload
-                    )
+                client = self._get_client()
+                response = await client.post(
+                    self.endpoint,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout_seconds
+                )
+                
+                if response.status_code == 200:
+                    result = response.json()
                     
-                    if response.status_code == 200:
-                        result = response.json()
-                        
-                        # Extract text from response
-                        output = result.get("output", {})
-                        choices = output.get("choices", [])
-                        
-                        if choices:
-                            message = choices[0].get("message", {})
-                            content = message.get("content", [])
-                            
-                            # Find text content
-                            text_content = ""
-                            for item in content:
-                                if isinstance(item, dict) and item.get("text"):
-                                    text_content = item["text"]
-                                    break
-                            
-                            if text_content:
-                                logger.info(f"Vision analysis successful for req_id={req_id}")
-                                return VisionResult(
-                                    text=text_content,
-                                    confidence=None,
-                                    error=None
-                                )
-                        
-                        # No valid response
-                        error_msg = "No valid response from vision model"
-                        logger.error(error_msg)
-                        return VisionResult(text="", confidence=None, error=error_msg)
+                    # Extract text from response
+                    output = result.get("output", {})
+                    choices = output.get("choices", [])
                     
-                    else:
-                        error_msg = f"API error: {response.status_code} - {response.text}"
-                        logger.error(error_msg)
+                    if choices:
+                        message = choices[0].get("message", {})
+                        content = message.get("content", [])
                         
-                        # Retry on server errors
-                        if response.status_code >= 500 and attempt < self.max_retries:
-                            logger.info(f"Retrying in {self.retry_delay}s...")
-                            await asyncio.sleep(self.retry_delay)
-                            continue
+                        # Find text content
+                        text_content = ""
+                        for item in content:
+                            if isinstance(item, dict) and item.get("text"):
+                                text_content = item["text"]
+                                break
                         
-                        return VisionResult(text="", confidence=None, error=error_msg)
+                        if text_content:
+                            logger.info(f"Vision analysis successful for req_id={req_id}")
+                            return VisionResult(
+                                text=text_content,
+                                confidence=None,
+                                error=None
+                            )
+                    
+                    # No valid response
+                    error_msg = "No valid response from vision model"
+                    logger.error(error_msg)
+                    return VisionResult(text="", confidence=None, error=error_msg)
+                
+                else:
+                    error_msg = f"API error: {response.status_code} - {response.text}"
+                    logger.error(error_msg)
+                    
+                    # Retry on server errors
+                    if response.status_code >= 500 and attempt < self.max_retries:
+                        logger.info(f"Retrying in {self.retry_delay}s...")
+                        await asyncio.sleep(self.retry_delay)
+                        continue
+                    
+                    return VisionResult(text="", confidence=None, error=error_msg)
                 
             except asyncio.TimeoutError:
                 error_msg = f"Vision API timeout ({self.timeout_seconds}s)"
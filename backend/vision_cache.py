@@ -0,0 +1,122 @@
+# Response cache for vision model analysis
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from backend.models import VisionResult
+
+logger = logging.getLogger(__name__)
+
+# Words (with apostrophes), numbers, and single CJK characters
+_TOKEN_RE = re.compile(r"[a-z0-9']+|[\u3400-\u9fff]")
+
+
+def image_hash(image_bytes: bytes) -> str:
+    """Compact content hash used to key cached vision results"""
+    return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+
+def prompt_tokens(prompt: str) -> Tuple[str, ...]:
+    """Lowercased word/number tokens of a prompt; each CJK character is a token"""
+    return tuple(_TOKEN_RE.findall(prompt.lower()))
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt reduced to its tokens, so case, punctuation and spacing do not matter"""
+    return " ".join(prompt_tokens(prompt))
+
+
+class VisionCache:
+    """
+    LRU cache with TTL for vision results on the same image.
+    
+    Results are keyed by (image hash, normalized prompt): questions that
+    differ only in case, punctuation or spacing ("What is this?" /
+    "what is this") are served from memory instead of another call to the
+    vision model. Any changed or reordered word - "on"/"off", "left"/"right",
+    a number - is a miss, since it can change the answer.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 3600):
+        """
+        Initialize vision cache.
+        
+        Args:
+            maxsize: Maximum number of cached results
+            ttl_seconds: How long a cached result stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        # (image hash, normalized prompt) -> (stored at, original prompt, result)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str, VisionResult]]" = OrderedDict()
+        self.hits = 0
+        self.normalized_hits = 0
+        self.misses = 0
+    
+    def get(self, img_hash: str, prompt: str) -> Optional[VisionResult]:
+        """
+        Look up a cached result for an image and prompt.
+        
+        Args:
+            img_hash: Hash from image_hash()
+            prompt: Prompt/question about the image
+        
+        Returns:
+            Cached VisionResult, or None on miss
+        """
+        key = (img_hash, normalize_prompt(prompt))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        stored_at, cached_prompt, result = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        if cached_prompt == prompt:
+            self.hits += 1
+        else:
+            # Same question worded with different case/punctuation
+            self.normalized_hits += 1
+            logger.debug(f"Normalized cache hit: '{prompt}' ~ '{cached_prompt}'")
+        return result
+    
+    def put(self, img_hash: str, prompt: str, result: VisionResult) -> None:
+        """
+        Store a successful result, evicting the least recently used entry.
+        
+        Args:
+            img_hash: Hash from image_hash()
+            prompt: Prompt/question about the image
+            result: Vision result (results with an error are not cached)
+        """
+        if result.error:
+            return
+        
+        key = (img_hash, normalize_prompt(prompt))
+        self._entries[key] = (time.monotonic(), prompt, result)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached results"""
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        """Get statistics about the cache"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "normalized_hits": self.normalized_hits,
+            "misses": self.misses
+        }
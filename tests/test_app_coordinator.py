@@ -0,0 +1,71 @@
+# Unit tests for App Coordinator
+import pytest
+from backend.app_coordinator import AppCoordinator
+from backend.models import Event, EventType
+
+
+@pytest.fixture
+def app_coordinator(mock_settings):
+    """Create app coordinator for testing"""
+    return AppCoordinator(mock_settings)
+
+
+def capture_event(req_id: str, image_ref: str) -> Event:
+    """CAPTURE_RECEIVED event as published by the camera endpoint"""
+    return Event(
+        event_type=EventType.CAPTURE_RECEIVED.value,
+        timestamp=0.0,
+        req_id=req_id,
+        data={"filename": f"{req_id}.jpg", "image_size": 4, "format": "jpeg", "image_ref": image_ref}
+    )
+
+
+@pytest.mark.asyncio
+async def test_stashed_image_handed_to_capture_coordinator(app_coordinator, monkeypatch):
+    """Test stash -> CAPTURE_RECEIVED -> release"""
+    received = []
+    monkeypatch.setattr(
+        app_coordinator.capture_coordinator, "receive_image",
+        lambda req_id, image_bytes: received.append((req_id, image_bytes))
+    )
+    
+    image_ref = app_coordinator.stash_image("req_1", b"jpeg")
+    await app_coordinator.handle_capture_received(capture_event("req_1", image_ref))
+    
+    assert received == [("req_1", b"jpeg")]
+    assert not app_coordinator._image_store
+
+
+@pytest.mark.asyncio
+async def test_stashed_image_released_on_capture_timeout(app_coordinator, monkeypatch):
+    """Test that an image nobody consumed is released when the trigger gives up"""
+    async def no_image(req_id):
+        app_coordinator.stash_image(req_id, b"late")
+        return None
+    
+    async def no_prewarm():
+        pass
+    
+    monkeypatch.setattr(app_coordinator.capture_coordinator, "wait_for_image", no_image)
+    monkeypatch.setattr(app_coordinator.vision_adapter, "prewarm", no_prewarm)
+    
+    event = Event(
+        event_type=EventType.TRIGGER_FIRED.value,
+        timestamp=0.0,
+        req_id="req_1",
+        data={"trigger_text": "describe"}
+    )
+    await app_coordinator.handle_trigger_fired(event)
+    
+    assert not app_coordinator._image_store
+
+
+def test_stash_drops_oldest_unclaimed_image(app_coordinator):
+    """Test that the stash is bounded and evicts the oldest image first"""
+    limit = app_coordinator.max_stashed_images
+    for i in range(limit + 1):
+        app_coordinator.stash_image(f"req_{i}", b"jpeg")
+    
+    assert len(app_coordinator._image_store) == limit
+    assert "req_0" not in app_coordinator._image_store
+    assert f"req_{limit}" in app_coordinator._image_store
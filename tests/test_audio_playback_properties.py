@@ -3,6 +3,7 @@ import pytest
 import asyncio
 import time
 import base64
+import json
 from hypothesis import given, strategies as st, settings
 from backend.audio_playback_coordinator import AudioPlaybackCoordinator, PlaybackConfig
 from backend.event_bus import EventBus
@@ -22,6 +23,10 @@ class MockWebSocket:
             raise Exception("WebSocket closed")
         self.sent_messages.append(data)
     
+    async def send_text(self, data):
+        """Mock send_text method (JSON text frames)"""
+        await self.send_json(json.loads(data))
+    
     async def close(self):
         """Mock close method"""
         self.closed = True
@@ -442,6 +447,10 @@ class InterruptibleWebSocket:
         
         self.sent_messages.append(data)
     
+    async def send_text(self, data):
+        """Mock send_text method (JSON text frames)"""
+        await self.send_json(json.loads(data))
+    
     async def close(self):
         """Mock close method"""
         self.closed = True
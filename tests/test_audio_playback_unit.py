@@ -1,8 +1,12 @@
 # Unit tests for Audio Playback Coordinator
 import pytest
 import asyncio
+import base64
 import time
-from backend.audio_playback_coordinator import AudioPlaybackCoordinator, PlaybackConfig
+from backend.audio_playback_coordinator import (
+    AudioPlaybackCoordinator, PlaybackConfig,
+    AUDIO_FRAME_HEADER, AUDIO_FRAME_MAGIC, request_hash
+)
 from backend.event_bus import EventBus
 from backend.models import Event, EventType
 from tests.test_audio_playback_properties import MockWebSocket
@@ -328,3 +332,127 @@ async def test_empty_audio_data(playback_coordinator, event_bus):
         if msg.get("type") == "audio_chunk"
     ]
     assert len(audio_chunks) == 0
+
+
+@pytest.mark.parametrize("chunk_size", [4092, 4096])
+def test_encode_chunks_matches_per_chunk_encoding(chunk_size):
+    """Test that one-shot and per-chunk encoding produce identical chunks"""
+    audio_data = bytes(range(256)) * 40
+    
+    chunks = list(AudioPlaybackCoordinator._encode_chunks(audio_data, chunk_size))
+    
+    expected = [
+        base64.b64encode(audio_data[i:i + chunk_size]).decode()
+        for i in range(0, len(audio_data), chunk_size)
+    ]
+    assert chunks == expected
+
+
+class BinaryMockWebSocket(MockWebSocket):
+    """Mock WebSocket that also records binary frames"""
+    
+    def __init__(self):
+        super().__init__()
+        self.sent_frames = []
+    
+    async def send_bytes(self, data):
+        """Mock send_bytes method"""
+        self.sent_frames.append(bytes(data))
+
+
+@pytest.mark.asyncio
+async def test_binary_audio_streaming(event_bus, playback_config):
+    """Test raw binary audio frames for devices that advertise support"""
+    coordinator = AudioPlaybackCoordinator(event_bus, playback_config)
+    mock_ws = BinaryMockWebSocket()
+    coordinator.register_device("test_device", mock_ws, binary_audio=True)
+    audio_data = bytes(range(256)) * 40
+    
+    await coordinator._stream_audio(
+        audio_data=audio_data,
+        device_id="test_device",
+        request_id="test_binary",
+        audio_format="pcm",
+        sample_rate=16000
+    )
+    
+    # One JSON header frame, no base64 chunks
+    assert [msg["type"] for msg in mock_ws.sent_messages] == ["audio_begin"]
+    begin = mock_ws.sent_messages[0]
+    assert begin["total_chunks"] == len(mock_ws.sent_frames) == 3
+    
+    payload = b""
+    for sequence, frame in enumerate(mock_ws.sent_frames):
+        magic, req_hash, seq, total = AUDIO_FRAME_HEADER.unpack_from(frame)
+        assert magic == AUDIO_FRAME_MAGIC
+        assert req_hash == begin["request_hash"] == request_hash("test_binary")
+        assert (seq, total) == (sequence, 3)
+        payload += frame[AUDIO_FRAME_HEADER.size:]
+    assert payload == audio_data
+
+
+async def audio_pieces(audio_data, piece_size):
+    """Yield audio in producer-sized pieces"""
+    for start in range(0, len(audio_data), piece_size):
+        await asyncio.sleep(0)
+        yield audio_data[start:start + piece_size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("piece_size", [1000, 4096, 9000])
+async def test_incremental_audio_streaming(event_bus, playback_config, piece_size):
+    """Test that an audio_stream is re-chunked and closed with audio_end"""
+    coordinator = AudioPlaybackCoordinator(event_bus, playback_config)
+    mock_ws = MockWebSocket()
+    coordinator.register_device("test_device", mock_ws)
+    audio_data = bytes(range(256)) * 40
+    
+    await coordinator._stream_audio(
+        audio_data=b"",
+        device_id="test_device",
+        request_id="test_stream",
+        audio_format="pcm",
+        sample_rate=16000,
+        audio_stream=audio_pieces(audio_data, piece_size)
+    )
+    
+    chunks = [msg for msg in mock_ws.sent_messages if msg["type"] == "audio_chunk"]
+    assert [msg["sequence"] for msg in chunks] == [0, 1, 2]
+    assert all(msg["total_chunks"] is None for msg in chunks)
+    assert mock_ws.get_audio_chunks()[0] == audio_data[:playback_config.chunk_size]
+    assert b"".join(mock_ws.get_audio_chunks()) == audio_data
+    assert mock_ws.sent_messages[-1] == {
+        "type": "audio_end",
+        "request_id": "test_stream",
+        "total_chunks": 3
+    }
+
+
+@pytest.mark.asyncio
+async def test_unplayed_audio_stream_is_closed(playback_coordinator, event_bus):
+    """Test that a stream for a device that is not connected is closed, not left suspended"""
+    closed = asyncio.Event()
+    
+    async def producer():
+        try:
+            yield b"\x00\x01" * 100
+        finally:
+            closed.set()
+    
+    stream = producer()
+    await stream.__anext__()  # Producer holds resources once started
+    
+    audio_event = Event(
+        event_type=EventType.AUDIO_READY.value,
+        timestamp=time.time(),
+        req_id="test_unplayed",
+        data={
+            "audio_stream": stream,
+            "audio_format": "pcm",
+            "sample_rate": 16000,
+            "device_id": "non_existent_device"
+        }
+    )
+    
+    await event_bus.publish(audio_event)
+    await asyncio.wait_for(closed.wait(), timeout=1.0)
@@ -0,0 +1,99 @@
+# Unit tests for Capture Coordinator
+import asyncio
+import io
+import pytest
+from PIL import Image
+from backend.capture_coordinator import CaptureCoordinator, _jpeg_dimensions
+from backend.event_bus import EventBus
+from backend.models import EventType, RequestState
+
+
+def make_jpeg(width: int, height: int, **options) -> bytes:
+    """Encode a solid-colour JPEG of the given size"""
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buf, "JPEG", **options)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def capture_coordinator():
+    """Create capture coordinator for testing"""
+    return CaptureCoordinator(event_bus=EventBus(buffer_size=10), timeout_seconds=1)
+
+
+@pytest.mark.parametrize("width,height,options", [
+    (640, 480, {}),
+    (320, 240, {"progressive": True}),
+    (17, 3, {"quality": 20}),
+])
+def test_jpeg_dimensions_from_header(width, height, options):
+    """Test that dimensions are read from the start-of-frame header"""
+    assert _jpeg_dimensions(make_jpeg(width, height, **options)) == (width, height)
+
+
+def test_jpeg_dimensions_rejects_non_jpeg():
+    """Test that non-JPEG or truncated data returns None"""
+    assert _jpeg_dimensions(b"\x89PNG\r\n\x1a\n") is None
+    assert _jpeg_dimensions(b"\xff\xd8\xff") is None
+    assert _jpeg_dimensions(b"") is None
+
+
+def test_validate_image(capture_coordinator):
+    """Test size and resolution limits"""
+    assert capture_coordinator.validate_image(make_jpeg(640, 480))
+    assert not capture_coordinator.validate_image(make_jpeg(800, 600))
+    assert not capture_coordinator.validate_image(b"not an image")
+
+
+def test_validate_image_rejects_bad_framing(capture_coordinator):
+    """Test that non-JPEG and truncated JPEG data are rejected up front"""
+    jpeg = make_jpeg(64, 48)
+    
+    assert not capture_coordinator.validate_image(jpeg[:-2])
+    assert not capture_coordinator.validate_image(b"\x89PNG" + jpeg[4:])
+    assert not capture_coordinator.validate_image(b"\xff\xd8")
+
+
+@pytest.mark.asyncio
+async def test_capture_request_and_receive(capture_coordinator):
+    """Test the request -> receive -> wait flow"""
+    jpeg = make_jpeg(64, 48)
+    await capture_coordinator.request_capture("req-1", "what is this")
+    
+    assert capture_coordinator.receive_image("req-1", jpeg)
+    assert await capture_coordinator.wait_for_image("req-1") == jpeg
+    assert capture_coordinator.pending_captures == {}
+    assert capture_coordinator.state == RequestState.LISTENING.value
+
+
+@pytest.mark.asyncio
+async def test_capture_retries_after_timeout():
+    """Test that a timed-out capture is re-requested up to max_retries times"""
+    event_bus = EventBus(buffer_size=10)
+    coordinator = CaptureCoordinator(event_bus=event_bus, timeout_seconds=0.05, max_retries=2)
+    await coordinator.request_capture("req-2", "what is this")
+    
+    assert await coordinator.wait_for_image("req-2") is None
+    
+    requests = event_bus.get_history(event_type=EventType.CAPTURE_REQUESTED.value)
+    assert sorted(e.data["attempt"] for e in requests) == [0, 1, 2]
+    assert all(e.data["trigger_text"] == "what is this" for e in requests)
+    assert len(event_bus.get_history(event_type=EventType.ERROR.value)) == 1
+    assert coordinator.pending_captures == {}
+    assert coordinator.state == RequestState.ERROR.value
+
+
+@pytest.mark.asyncio
+async def test_cancel_wakes_waiter_and_slot_is_reused(capture_coordinator):
+    """Test that cancelling returns None to the waiter and recycles its slot"""
+    await capture_coordinator.request_capture("req-3", "what is this")
+    slot = capture_coordinator.pending_captures["req-3"]
+    waiter = asyncio.create_task(capture_coordinator.wait_for_image("req-3"))
+    await asyncio.sleep(0)
+    
+    capture_coordinator.cancel_request("req-3")
+    assert await waiter is None
+    
+    await capture_coordinator.request_capture("req-4", "what is this")
+    assert capture_coordinator.pending_captures["req-4"] is slot
+    assert slot.image is None and not slot.cancelled
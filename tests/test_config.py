@@ -0,0 +1,46 @@
+# Unit tests for configuration
+from backend.config import (
+    Settings, api_key_configured, load_settings, reset_settings, validate_api_keys
+)
+
+
+def test_trigger_phrases_parsed_to_tuples(mock_settings):
+    """Test that default trigger phrases are exposed as stripped tuples"""
+    assert mock_settings.english_trigger_phrases[0] == "describe the view"
+    assert "前面是什麼" in mock_settings.chinese_trigger_phrases
+    assert isinstance(mock_settings.english_trigger_phrases, tuple)
+
+
+def test_trigger_phrases_drop_empty_entries():
+    """Test that stray commas do not produce empty trigger phrases"""
+    settings = Settings(
+        asr_api_key="a",
+        vision_api_key="v",
+        tts_api_key="t",
+        trigger_english_phrases=" what is this ,, describe the view,",
+    )
+    
+    assert settings.english_trigger_phrases == ("what is this", "describe the view")
+
+
+def test_load_settings_is_cached(monkeypatch):
+    """Test that settings are parsed once and reused"""
+    monkeypatch.setenv("ASR_API_KEY", "a")
+    monkeypatch.setenv("VISION_API_KEY", "v")
+    monkeypatch.setenv("TTS_API_KEY", "t")
+    reset_settings()
+    
+    try:
+        assert load_settings() is load_settings()
+    finally:
+        reset_settings()
+
+
+def test_placeholder_api_keys_rejected(mock_settings):
+    """Test that .env.example placeholder keys do not count as configured"""
+    assert api_key_configured("sk-real-key")
+    assert not api_key_configured("")
+    assert not api_key_configured("your_tts_api_key_here")
+    
+    settings = mock_settings.model_copy(update={"vision_api_key": "your_vision_api_key_here"})
+    assert not validate_api_keys(settings)
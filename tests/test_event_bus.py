@@ -0,0 +1,91 @@
+# Unit tests for Event Bus
+import asyncio
+import pytest
+from backend.event_bus import EventBus
+from backend.models import Event
+
+
+def make_event(n: int, event_type: str = "test") -> Event:
+    """Numbered event; req_id carries the number"""
+    return Event(event_type=event_type, timestamp=float(n), req_id=f"req_{n}")
+
+
+async def start(subscription):
+    """Begin a subscription so its queue is registered; returns the first-item task"""
+    first = asyncio.ensure_future(subscription.__anext__())
+    await asyncio.sleep(0)
+    return first
+
+
+@pytest.mark.asyncio
+async def test_full_subscriber_queue_drops_oldest():
+    """Test that a slow subscriber loses its oldest events and they are counted"""
+    bus = EventBus(buffer_size=2)
+    subscription = bus.subscribe("test")
+    first = await start(subscription)
+    
+    await bus.publish(make_event(0))
+    assert (await first).req_id == "req_0"
+    
+    # Nobody reading: three events into a queue of two
+    for n in range(1, 4):
+        await bus.publish(make_event(n))
+    
+    assert list(bus.dropped_counts.values()) == [1]
+    assert bus.get_stats()["dropped_events"] == {"test": [1]}
+    assert (await subscription.__anext__()).req_id == "req_2"
+    assert (await subscription.__anext__()).req_id == "req_3"
+    
+    await subscription.aclose()
+    assert bus.dropped_counts == {}
+    assert bus.subscribers["test"] == []
+
+
+@pytest.mark.asyncio
+async def test_drop_only_affects_full_subscriber():
+    """Test that a subscriber keeping up loses nothing when another falls behind"""
+    bus = EventBus(buffer_size=2)
+    slow = bus.subscribe("*")
+    fast = bus.subscribe("test")
+    slow_first = await start(slow)
+    fast_first = await start(fast)
+    
+    await bus.publish(make_event(0))
+    await slow_first
+    await fast_first
+    
+    received = []
+    for n in range(1, 5):
+        await bus.publish(make_event(n))
+        received.append((await fast.__anext__()).req_id)
+    
+    assert received == ["req_1", "req_2", "req_3", "req_4"]
+    assert sorted(bus.dropped_counts.values()) == [0, 2]
+    
+    await slow.aclose()
+    await fast.aclose()
+    assert bus.dropped_counts == {}
+
+
+@pytest.mark.asyncio
+async def test_subscribe_batches_in_publish_order():
+    """Test that queued events come out as batches of at most max_batch, in order"""
+    bus = EventBus(buffer_size=10)
+    batches = bus.subscribe_batches("*", max_batch=3)
+    first = await start(batches)
+    
+    for n in range(7):
+        await bus.publish(make_event(n))
+    
+    received = [await first]
+    while sum(len(batch) for batch in received) < 7:
+        received.append(await batches.__anext__())
+    
+    assert [len(batch) for batch in received] == [3, 3, 1]
+    assert [event.req_id for batch in received for event in batch] == [
+        f"req_{n}" for n in range(7)
+    ]
+    
+    await batches.aclose()
+    assert bus.subscribers["*"] == []
+    assert bus.dropped_counts == {}
@@ -0,0 +1,81 @@
+# Unit tests for Image Loader
+import asyncio
+import pytest
+from backend.image_loader import ImageLoader
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_batch(tmp_path, monkeypatch):
+    """Test that reads issued together are served by a single worker hop"""
+    loader = ImageLoader()
+    hops = []
+    real_to_thread = asyncio.to_thread
+    
+    async def counting_to_thread(func, *args):
+        hops.append(len(args[0]))
+        return await real_to_thread(func, *args)
+    
+    monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+    
+    paths = [tmp_path / f"frame_{i}.jpg" for i in range(5)]
+    for i, path in enumerate(paths):
+        path.write_bytes(bytes([i]) * 10)
+    
+    results = await asyncio.gather(*(loader.read(p) for p in paths))
+    
+    assert hops == [5]
+    assert results == [bytes([i]) * 10 for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_batches_split_at_max_batch(tmp_path, monkeypatch):
+    """Test that a burst larger than max_batch is split across worker hops"""
+    loader = ImageLoader(max_batch=2)
+    hops = []
+    real_to_thread = asyncio.to_thread
+    
+    async def counting_to_thread(func, *args):
+        hops.append(len(args[0]))
+        return await real_to_thread(func, *args)
+    
+    monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+    
+    path = tmp_path / "frame.jpg"
+    path.write_bytes(b"jpeg")
+    
+    results = await asyncio.gather(*(loader.read(path) for _ in range(5)))
+    
+    assert sorted(hops) == [1, 2, 2]
+    assert results == [b"jpeg"] * 5
+
+
+@pytest.mark.asyncio
+async def test_read_error_is_raised_to_caller(tmp_path):
+    """Test that a missing file raises while the rest of its batch succeeds"""
+    loader = ImageLoader()
+    good = tmp_path / "good.jpg"
+    good.write_bytes(b"jpeg")
+    
+    results = await asyncio.gather(
+        loader.read(good),
+        loader.read(tmp_path / "missing.jpg"),
+        return_exceptions=True
+    )
+    
+    assert results[0] == b"jpeg"
+    assert isinstance(results[1], FileNotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_reads(tmp_path):
+    """Test that close() serves queued reads without waiting for the debounce"""
+    loader = ImageLoader(debounce_seconds=60)
+    path = tmp_path / "frame.jpg"
+    path.write_bytes(b"jpeg")
+    
+    read_task = asyncio.create_task(loader.read(path))
+    await asyncio.sleep(0)  # let the read queue up
+    
+    await asyncio.wait_for(loader.close(), timeout=5)
+    
+    assert await asyncio.wait_for(read_task, timeout=1) == b"jpeg"
@@ -0,0 +1,42 @@
+# Unit tests for Image Writer
+import asyncio
+import pytest
+from backend.image_writer import ImageWriter
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_batch(tmp_path, monkeypatch):
+    """Test that writes issued together are served by a single worker hop"""
+    writer = ImageWriter()
+    hops = []
+    real_to_thread = asyncio.to_thread
+    
+    async def counting_to_thread(func, *args):
+        hops.append(len(args[0]))
+        return await real_to_thread(func, *args)
+    
+    monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+    
+    paths = [tmp_path / f"frame_{i}.jpg" for i in range(5)]
+    await asyncio.gather(*(writer.write(p, bytes([i]) * 10) for i, p in enumerate(paths)))
+    
+    assert hops == [5]
+    assert [p.read_bytes() for p in paths] == [bytes([i]) * 10 for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_write_error_is_raised_to_caller(tmp_path):
+    """Test that a failed write raises while the rest of its batch succeeds"""
+    writer = ImageWriter()
+    good = tmp_path / "good.jpg"
+    bad = tmp_path / "missing_dir" / "bad.jpg"
+    
+    results = await asyncio.gather(
+        writer.write(good, b"jpeg"),
+        writer.write(bad, b"jpeg"),
+        return_exceptions=True
+    )
+    
+    assert results[0] is None
+    assert isinstance(results[1], FileNotFoundError)
+    assert good.read_bytes() == b"jpeg"
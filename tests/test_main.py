@@ -0,0 +1,57 @@
+# Unit tests for the backend entry point's Web UI forwarding
+import asyncio
+import pytest
+from backend.models import Event
+
+
+@pytest.fixture
+def main(monkeypatch):
+    """Import the app module with placeholder API keys"""
+    for name in ("ASR_API_KEY", "VISION_API_KEY", "TTS_API_KEY"):
+        monkeypatch.setenv(name, "test_key")
+    from backend import main
+    return main
+
+
+@pytest.fixture
+async def outbox(main, monkeypatch):
+    """One Web UI client outbox, fed by a running forwarder"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=main.UI_QUEUE_SIZE)
+    monkeypatch.setattr(main, "web_ui_clients", {1: queue})
+    task = asyncio.create_task(main.forward_events_to_ui())
+    await asyncio.sleep(0)
+    yield queue
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def bad_event() -> Event:
+    """Event whose data cannot be serialized"""
+    return Event(event_type="test", timestamp=0.0, req_id="bad", data={"value": object()})
+
+
+def good_event() -> Event:
+    """Event that serializes normally"""
+    return Event(event_type="test", timestamp=0.0, req_id="good")
+
+
+@pytest.mark.asyncio
+async def test_forwarder_survives_unserializable_event(main, outbox):
+    """Test that a bad event does not stop forwarding to the Web UI"""
+    await main.event_bus.publish(bad_event())
+    await asyncio.sleep(0.01)
+    await main.event_bus.publish(good_event())
+    
+    payload = await asyncio.wait_for(outbox.get(), timeout=1)
+    assert payload == good_event().to_json()
+
+
+@pytest.mark.asyncio
+async def test_bad_event_does_not_drop_its_batch(main, outbox):
+    """Test that the other events of a batch are forwarded when one cannot be serialized"""
+    # Published together, both events reach the forwarder as one batch
+    await main.event_bus.publish(bad_event())
+    await main.event_bus.publish(good_event())
+    
+    payload = await asyncio.wait_for(outbox.get(), timeout=1)
+    assert payload == good_event().to_json()
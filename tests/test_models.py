@@ -1,4 +1,5 @@
 # Unit tests for data models
+import json
 import pytest
 import time
 from backend.models import (
@@ -38,6 +39,49 @@ def test_event_to_dict():
     assert event_dict["data"]["trigger_text"] == "識別物品"
 
 
+def test_event_to_dict_omits_binary_payloads():
+    """Test that binary data (image/audio bytes) is left out of serialization"""
+    event = Event(
+        event_type=EventType.CAPTURE_RECEIVED.value,
+        timestamp=time.time(),
+        req_id="test-789",
+        data={"filename": "test.jpg", "image_bytes": b"\xff\xd8\xff\xd9"}
+    )
+    
+    event_dict = event.to_dict()
+    assert event_dict["data"] == {"filename": "test.jpg"}
+    assert "image_bytes" in event.data
+
+
+def test_event_to_dict_omits_streams():
+    """Test that async audio streams are left out of serialization"""
+    async def audio_stream():
+        yield b"\x00\x00"
+    
+    event = Event(
+        event_type=EventType.AUDIO_READY.value,
+        timestamp=time.time(),
+        req_id="test-790",
+        data={"audio_stream": audio_stream(), "sample_rate": 16000}
+    )
+    
+    assert event.to_dict()["data"] == {"sample_rate": 16000}
+
+
+def test_event_to_json_is_cached():
+    """Test that the JSON form is encoded once and reused"""
+    event = Event(
+        event_type=EventType.VISION_RESULT.value,
+        timestamp=1.5,
+        req_id="test-321",
+        data={"text": "一個蘋果", "image_bytes": b"\xff\xd8"}
+    )
+    
+    encoded = event.to_json()
+    assert json.loads(encoded) == event.to_dict()
+    assert event.to_json() is encoded
+
+
 def test_request_context_creation():
     """Test RequestContext dataclass creation"""
     ctx = RequestContext(
@@ -58,14 +102,14 @@ def test_connection_state_creation():
     """Test ConnectionState dataclass creation"""
     now = time.time()
     conn = ConnectionState(
-        conn_id="conn-001",
+        conn_id=1,
         conn_type=ConnectionType.ESP32_AUDIO.value,
         connected_at=now,
         last_heartbeat=now,
         metadata={"device_id": "esp32-001"}
     )
     
-    assert conn.conn_id == "conn-001"
+    assert conn.conn_id == 1
     assert conn.conn_type == ConnectionType.ESP32_AUDIO.value
     assert conn.metadata["device_id"] == "esp32-001"
 
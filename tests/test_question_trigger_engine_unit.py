@@ -217,6 +217,36 @@ async def test_trigger_with_prefix_and_suffix(trigger_engine):
     assert match.phrase == "what do I see"
 
 
+@pytest.mark.asyncio
+async def test_exact_match_preferred_over_fuzzy(trigger_engine):
+    """Test that an exact later phrase beats a fuzzy match on an earlier one"""
+    text = "describe the vie... no, what's in front of me"
+    match = trigger_engine._detect_trigger(text)
+    
+    assert match is not None
+    assert match.phrase == "what's in front of me"
+    assert match.confidence == 1.0
+    assert match.position == text.index("what's in front of me")
+
+
+@pytest.mark.asyncio
+async def test_long_transcription_detected(trigger_engine, event_bus):
+    """Test that a trigger at the end of a long transcription is detected"""
+    text = "okay so I am standing at the corner of the street and I wonder, what do I see"
+    event = Event(
+        event_type=EventType.ASR_FINAL.value,
+        timestamp=time.time(),
+        req_id="req-long",
+        data={"text": text, "device_id": "esp32"}
+    )
+    await trigger_engine._on_transcription(event)
+    
+    detected = event_bus.get_history(event_type=EventType.QUESTION_DETECTED.value)
+    assert len(detected) == 1
+    assert detected[0].req_id == "req-long"
+    assert detected[0].data["question"] == text
+
+
 @pytest.mark.asyncio
 async def test_cooldown_reset(trigger_engine):
     """Test cooldown reset functionality"""
@@ -0,0 +1,63 @@
+# Unit tests for Trigger Engine
+import pytest
+import time
+from backend.trigger_engine import TriggerEngine
+from backend.event_bus import EventBus
+from backend.models import EventType
+
+
+@pytest.fixture
+def trigger_engine():
+    """Create trigger engine for testing"""
+    return TriggerEngine(EventBus(buffer_size=100), cooldown_seconds=3)
+
+
+def test_keyword_trigger(trigger_engine):
+    """Test that a keyword anywhere in the text fires a trigger"""
+    event = trigger_engine.check_trigger("你好，幫我認一下")
+    
+    assert event is not None
+    assert event.event_type == EventType.TRIGGER_FIRED.value
+    assert event.data["matched_keyword"] == "幫我認"
+    assert event.timestamp == trigger_engine.last_trigger_time
+    assert trigger_engine.is_in_cooldown()
+
+
+def test_no_keyword(trigger_engine):
+    """Test that text without keywords does not trigger"""
+    assert trigger_engine.check_trigger("hello world") is None
+    assert trigger_engine.last_trigger_time is None
+
+
+def test_last_trigger_time_drives_cooldown(trigger_engine):
+    """Test that assigning last_trigger_time starts or clears the cooldown"""
+    trigger_engine.last_trigger_time = time.time()
+    assert trigger_engine.is_in_cooldown()
+    
+    trigger_engine.last_trigger_time = time.time() - 10
+    assert not trigger_engine.is_in_cooldown()
+    
+    trigger_engine.last_trigger_time = None
+    assert not trigger_engine.is_in_cooldown()
+
+
+def test_cooldown_reset(trigger_engine):
+    """Test cooldown reset functionality"""
+    trigger_engine.last_trigger_time = time.time()
+    assert trigger_engine.is_in_cooldown()
+    
+    trigger_engine.reset_cooldown()
+    assert not trigger_engine.is_in_cooldown()
+    assert trigger_engine.last_trigger_time is None
+
+
+def test_longest_overlapping_keyword_wins():
+    """Test that a keyword containing a shorter keyword is reported, whatever the list order"""
+    engine = TriggerEngine(
+        EventBus(buffer_size=100),
+        trigger_keywords=("幫我認", "幫我認下呢個")
+    )
+    event = engine.check_trigger("喂，幫我認下呢個係咩")
+    
+    assert event is not None
+    assert event.data["matched_keyword"] == "幫我認下呢個"
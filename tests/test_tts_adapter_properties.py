@@ -324,7 +324,8 @@ async def test_property_tts_retry_logic(description, fail_count):
         endpoint="wss://test.example.com",
         audio_format="pcm",
         sample_rate=16000,
-        timeout_seconds=2  # Allow 1 retry
+        timeout_seconds=2,
+        max_retries=1  # Allow 1 retry
     )
     failing_client = FailingTTSClient(tts_config, fail_count=fail_count)
     adapter = TTSAdapter(event_bus, failing_client, tts_config)
@@ -391,7 +392,8 @@ async def test_property_tts_retry_exhaustion():
         endpoint="wss://test.example.com",
         audio_format="pcm",
         sample_rate=16000,
-        timeout_seconds=2  # Allow 1 retry
+        timeout_seconds=2,
+        max_retries=1  # Allow 1 retry
     )
     failing_client = FailingTTSClient(tts_config, fail_count=10)  # Always fail
     adapter = TTSAdapter(event_bus, failing_client, tts_config)
@@ -285,3 +285,168 @@ async def test_special_characters_in_description(tts_adapter, event_bus):
     ]
     
     assert len(audio_events) > 0
+
+
+class FakeTTSSocket:
+    """Stand-in TTS connection: each run-task returns two audio frames, delay apart"""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.closed = False
+        self.requests = 0
+        self._frames = []
+    
+    async def send(self, frame: str):
+        self.requests += 1
+        self._frames = [b"\x00\x00" * 100, b"\x01\x00" * 100, '{"header":{"event":"task-finished"}}']
+    
+    async def recv(self):
+        if len(self._frames) > 1:
+            await asyncio.sleep(self.delay)
+        return self._frames.pop(0)
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeSocketTTSClient(TTSClient):
+    """Real TTSClient (lock, deadlines) talking to a FakeTTSSocket"""
+    
+    def __init__(self, config: TTSConfig, delay: float):
+        super().__init__(config)
+        self.socket = FakeTTSSocket(delay)
+    
+    async def connect(self):
+        self.socket.closed = False
+        self.ws = self.socket
+
+
+@pytest.mark.asyncio
+async def test_retry_bounded_by_max_retries(event_bus):
+    """Test that a hung TTS request times out and is retried max_retries times"""
+    config = TTSConfig(
+        api_key="test_api_key",
+        endpoint="wss://test.example.com/tts",
+        timeout_seconds=0.1,
+        max_retries=1,
+        backoff_base=0.01
+    )
+    client = FakeSocketTTSClient(config, delay=10)
+    adapter = TTSAdapter(event_bus, client, config)
+    
+    started = time.monotonic()
+    with pytest.raises(TTSError):
+        await adapter._convert_to_speech_with_retry("Test description")
+    
+    assert client.socket.requests == 2
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_queued_conversions_not_charged_for_wait(event_bus):
+    """Test that a conversion queued behind another gets its own full timeout"""
+    config = TTSConfig(
+        api_key="test_api_key",
+        endpoint="wss://test.example.com/tts",
+        timeout_seconds=1.0,
+        max_retries=0,
+        concurrency=2
+    )
+    # Each conversion takes ~0.6 s: within budget alone, not counting the wait
+    client = FakeSocketTTSClient(config, delay=0.3)
+    adapter = TTSAdapter(event_bus, client, config)
+    await adapter.start()
+    
+    try:
+        for req_id in ("test_queued_1", "test_queued_2"):
+            await event_bus.publish(Event(
+                event_type=EventType.VISION_RESULT.value,
+                timestamp=time.time(),
+                req_id=req_id,
+                data={
+                    "description": "Test description",
+                    "device_id": "test_device"
+                }
+            ))
+        await asyncio.sleep(1.6)
+        
+        history = event_bus.get_history(limit=10)
+        assert [e.req_id for e in history if e.event_type == EventType.TTS_ERROR.value] == []
+        assert sorted(
+            e.req_id for e in history if e.event_type == EventType.AUDIO_READY.value
+        ) == ["test_queued_1", "test_queued_2"]
+    finally:
+        await adapter.stop()
+
+
+@pytest.mark.asyncio
+async def test_streamed_audio_ready(event_bus, tts_config):
+    """Test that stream_audio publishes an audio_stream instead of complete audio"""
+    tts_config.stream_audio = True
+    adapter = TTSAdapter(event_bus, MockTTSClient(tts_config), tts_config)
+    await adapter.start()
+    
+    try:
+        vision_event = Event(
+            event_type=EventType.VISION_RESULT.value,
+            timestamp=time.time(),
+            req_id="test_stream",
+            data={
+                "description": "Test description",
+                "device_id": "test_device"
+            }
+        )
+        
+        await event_bus.publish(vision_event)
+        await asyncio.sleep(0.2)
+        
+        history = event_bus.get_history(limit=10)
+        audio_events = [
+            e for e in history 
+            if e.event_type == EventType.AUDIO_READY.value
+        ]
+        
+        assert len(audio_events) == 1
+        assert "audio_data" not in audio_events[0].data
+        chunks = [chunk async for chunk in audio_events[0].data["audio_stream"]]
+        assert len(chunks) > 1
+        assert len(b"".join(chunks)) == tts_config.sample_rate * 2
+    finally:
+        await adapter.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_retried_until_first_chunk(event_bus, tts_config):
+    """Test that a stream failing before any audio is retried, and mid-stream failure is reported"""
+    tts_config.stream_audio = True
+    tts_config.backoff_base = 0.01
+    
+    class FlakyStreamClient:
+        def __init__(self, fail_after):
+            self.fail_after = fail_after
+            self.calls = 0
+        async def stream_speech(self, text: str):
+            self.calls += 1
+            for chunk in (b"\x00\x00" * 10, b"\x01\x00" * 10):
+                if self.fail_after.pop(0):
+                    raise TTSError("Service unavailable")
+                yield chunk
+    
+    # First attempt fails before any audio, second succeeds
+    client = FlakyStreamClient([True, False, False])
+    adapter = TTSAdapter(event_bus, client, tts_config)
+    chunks = [chunk async for chunk in adapter._stream_speech_with_retry("Test", "test_retry")]
+    assert client.calls == 2
+    assert len(chunks) == 2
+    
+    # Failure after audio was produced ends the stream with a TTS error event
+    client = FlakyStreamClient([False, True])
+    adapter = TTSAdapter(event_bus, client, tts_config)
+    stream = adapter._stream_speech_with_retry("Test", "test_midstream")
+    assert await stream.__anext__()
+    with pytest.raises(TTSError):
+        await stream.__anext__()
+    assert client.calls == 1
+    
+    history = event_bus.get_history(limit=10)
+    assert [e.req_id for e in history if e.event_type == EventType.TTS_ERROR.value] == ["test_midstream"]
@@ -125,3 +125,21 @@ def test_tts_config_custom_values():
     assert config.audio_format == "mp3"
     assert config.sample_rate == 24000
     assert config.timeout_seconds == 10.0
+
+
+@pytest.mark.asyncio
+async def test_convert_to_speech_returns_bytes(tts_config):
+    """Test that streamed chunks are combined into immutable bytes"""
+    client = TTSClient(tts_config)
+    pieces = [b"\x01\x00" * 700, b"\x02\x00" * 30000, b"\x03\x00"]
+    
+    async def fake_stream(text):
+        for piece in pieces:
+            yield piece
+    
+    client.stream_speech = fake_stream
+    
+    for _ in range(2):
+        audio_data = await client.convert_to_speech("Test")
+        assert type(audio_data) is bytes
+        assert audio_data == b"".join(pieces)
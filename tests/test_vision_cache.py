@@ -0,0 +1,97 @@
+# Unit tests for Vision Cache
+import pytest
+from backend.vision_cache import VisionCache, image_hash, prompt_tokens
+from backend.models import VisionResult
+
+
+IMAGE = image_hash(b"jpeg-bytes")
+
+
+def test_cache_hit_after_put():
+    """Test that a stored result is returned for the same image and prompt"""
+    cache = VisionCache(maxsize=4, ttl_seconds=60)
+    
+    assert cache.get(IMAGE, "what is this") is None
+    cache.put(IMAGE, "what is this", VisionResult(text="一個蘋果", confidence=0.9))
+    
+    result = cache.get(IMAGE, "what is this")
+    assert result is not None
+    assert result.text == "一個蘋果"
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_cache_skips_errors():
+    """Test that failed results are never cached"""
+    cache = VisionCache()
+    
+    cache.put(IMAGE, "what is this", VisionResult(text="", error="API timeout"))
+    assert cache.get(IMAGE, "what is this") is None
+
+
+def test_cache_evicts_least_recently_used():
+    """Test LRU eviction when maxsize is exceeded"""
+    cache = VisionCache(maxsize=2, ttl_seconds=60)
+    cache.put("a", "p", VisionResult(text="a"))
+    cache.put("b", "p", VisionResult(text="b"))
+    cache.get("a", "p")  # "b" becomes least recently used
+    cache.put("c", "p", VisionResult(text="c"))
+    
+    assert cache.get("b", "p") is None
+    assert cache.get("a", "p") is not None
+    assert cache.get("c", "p") is not None
+
+
+def test_cache_expires_entries():
+    """Test that entries older than the TTL are dropped"""
+    cache = VisionCache(maxsize=4, ttl_seconds=60)
+    cache.put(IMAGE, "what is this", VisionResult(text="a"))
+    cache.ttl_seconds = -1  # everything is now past its TTL
+    
+    assert cache.get(IMAGE, "what is this") is None
+    assert cache.get_stats()["size"] == 0
+
+
+def test_normalized_hit_for_equivalent_prompt():
+    """Test that a question differing only in case and punctuation is a cache hit"""
+    cache = VisionCache()
+    cache.put(IMAGE, "tell me what you see", VisionResult(text="一張桌子"))
+    cache.put(IMAGE, "前面是什麼", VisionResult(text="一扇門"))
+    
+    result = cache.get(IMAGE, "Tell me what you see?")
+    assert result is not None
+    assert result.text == "一張桌子"
+    assert cache.get(IMAGE, "前面是什麼？").text == "一扇門"
+    assert cache.get_stats()["normalized_hits"] == 2
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("is the stove in front of me turned on", "is the stove in front of me turned off"),
+    ("what is on the left side", "what is on the right side"),
+    ("how many steps are there, 3", "how many steps are there, 4"),
+    ("what is this", "what is this thing"),
+    ("is the dog left of the cat", "is the cat left of the dog"),
+    ("門開了嗎", "門關了嗎"),
+])
+def test_normalized_miss_when_wording_changes(cached, asked):
+    """Test that a changed or reordered word (on/off, left/right, numbers) is a miss"""
+    cache = VisionCache()
+    cache.put(IMAGE, cached, VisionResult(text="cached answer"))
+    
+    assert cache.get(IMAGE, asked) is None
+    assert cache.get_stats()["normalized_hits"] == 0
+
+
+def test_prompt_tokens():
+    """Test tokenization of English words, numbers and CJK characters"""
+    assert prompt_tokens("What's on the LEFT, 2 cups?") == ("what's", "on", "the", "left", "2", "cups")
+    assert prompt_tokens("前面是什麼？") == ("前", "面", "是", "什", "麼")
+
+
+def test_normalized_lookup_is_per_image():
+    """Test that the same prompt on a different image does not hit"""
+    cache = VisionCache()
+    cache.put(IMAGE, "tell me what you see", VisionResult(text="一張桌子"))
+    
+    assert cache.get(image_hash(b"other"), "tell me what you see") is None
+    assert cache.get(IMAGE, "describe the view") is None
@@ -35,7 +35,12 @@ class ESP32ASRClient {
             this.ws.onmessage = (event) => {
                 try {
                     const data = JSON.parse(event.data);
-                    this.handleEvent(data);
+                    // Bursts of events arrive batched as one array
+                    if (Array.isArray(data)) {
+                        data.forEach((item) => this.handleEvent(item));
+                    } else {
+                        this.handleEvent(data);
+                    }
                 } catch (error) {
                     console.error('Failed to parse message:', error);
                 }